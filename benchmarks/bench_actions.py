@@ -0,0 +1,234 @@
+"""Run every *_twikit action, and the main_menu flow, against fake_twikit.
+
+Each scenario runs one action for N accounts concurrently through
+run_account_jobs, exactly as the menu does, but with fake_twikit.FakeClient
+instead of twikit.Client and with time compressed: the pacer, retry backoff
+and the fake API latency all run on a clock that is --scale times faster
+than real time (default 100x, so a 60 s delay between actions takes 0.6 s).
+
+Each scenario starts from an empty working directory and fresh module state
+(pacer, read cache, already-done index, log writer), and reports:
+
+* actions: successful actions (log records with outcome ok)
+* wall: real seconds for the scenario; virtual = wall * scale
+* throughput: successful actions per virtual minute
+* p50/p95/p99: per-action latency (API call including retries and rate-limit
+  waits), in virtual milliseconds. Real CPU time is stretched by the same
+  factor, so event-loop saturation with many accounts shows up here too
+* api calls and peak Python memory (tracemalloc)
+
+The "menu" scenario drives main_menu with scripted answers ("Like tweets"
+for all accounts), so logins, prompts and the summary are included.
+
+Usage: python benchmarks/bench_actions.py [--accounts 1,10,100] [--actions like,follow]
+       [--scale 100] [--latency 0.2] [--error-rate 0.0] [--count 5]
+"""
+import argparse
+import asyncio
+import builtins
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import fake_twikit  # noqa: E402
+import twitter_twikit as tw  # noqa: E402
+
+DELAY = 60
+TWEET_URL = 'https://x.com/someone/status/1800000000000000001'
+
+
+class CompressedTime:
+    # A clock that runs `scale` times faster than real time, and a sleep that matches it
+    def __init__(self, scale):
+        self.scale = scale
+        self.origin = time.time()
+        self.started = time.monotonic()
+
+    def clock(self):
+        return self.origin + (time.monotonic() - self.started) * self.scale
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(max(0.0, seconds) / self.scale)
+
+
+def action_jobs(count):
+    # name -> job(client, account) returning the coroutine, as prepare_action_job builds them
+    return {
+        'post': lambda c, a: tw.post_tweet_twikit(c, 'bench tweet'),
+        'bulk': lambda c, a: tw.bulk_tweets_twikit(c, [f'bulk tweet {i}' for i in range(count)], DELAY, a),
+        'thread': lambda c, a: tw.thread_tweets_twikit(c, [f'thread tweet {i}' for i in range(count)], DELAY),
+        'search': lambda c, a: tw.search_tweets_twikit(c, 'bench', count),
+        'like': lambda c, a: tw.like_tweets_twikit(c, 'bench', count, DELAY),
+        'retweet': lambda c, a: tw.retweet_tweets_twikit(c, 'bench', count, DELAY),
+        'follow': lambda c, a: tw.follow_users_twikit(c, 'bench', count, DELAY),
+        'reply': lambda c, a: tw.reply_to_tweet_twikit(c, 'bench', 'bench reply', count, DELAY),
+        'reply_url': lambda c, a: tw.reply_to_tweet_url_twikit(c, TWEET_URL, 'bench reply'),
+        'retweet_follow': lambda c, a: tw.retweet_and_follow_twikit(c, 'bench', count, DELAY),
+        'follow_retweeters': lambda c, a: tw.follow_retweeters_twikit(c, TWEET_URL, count, DELAY),
+        'like_timeline': lambda c, a: tw.like_timeline_twikit(c, count, DELAY),
+    }
+
+
+def make_accounts(n):
+    return [{'name': f'bench{i}', 'username': f'bench_user{i}', 'email': f'bench{i}@example.com',
+             'password': 'x', 'cookies_file': f'cookies_bench_user{i}.json'} for i in range(n)]
+
+
+@contextlib.contextmanager
+def scenario_state(args):
+    # Fresh working directory and module state, compressed time, captured latencies
+    clock = CompressedTime(args.scale)
+    latencies = []
+    outcomes = []
+    clients = []
+
+    def make_client(shared_pool=None):
+        client = fake_twikit.FakeClient(latency=args.latency, jitter=args.latency / 2,
+                                        error_rates={'*': args.error_rate}, clock=clock.clock, sleep=clock.sleep)
+        clients.append(client)
+        return client
+
+    original_log_action = tw.log_action
+
+    def log_action(msg, action=None, target_id=None, outcome='ok', latency=None, account=None):
+        outcomes.append(outcome)
+        if latency is not None and outcome == 'ok':
+            latencies.append(latency * args.scale)
+        original_log_action(msg, action, target_id, outcome, latency, account)
+
+    saved = {name: getattr(tw, name) for name in
+             ('pacer', 'read_cache', 'done_index', 'session_pool', 'make_client', 'log_action', '_log_writer')}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        tw.pacer = tw.Pacer(clock=clock.clock, sleep=clock.sleep)
+        tw.read_cache = tw.TTLCache()
+        tw.done_index = tw.DoneIndex()
+        tw.session_pool = tw.SessionPool()
+        tw.make_client = make_client
+        tw.log_action = log_action
+        tw._log_writer = None
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                yield clock, latencies, outcomes, clients
+        finally:
+            if tw._log_writer is not None:
+                tw._log_writer.close()
+            if tw.done_index.db is not None:
+                tw.done_index.db.close()
+            for name, value in saved.items():
+                setattr(tw, name, value)
+            os.chdir(cwd)
+
+
+async def run_action(job, accounts, make_client):
+    jobs = []
+    for account in accounts:
+        client = make_client()
+        await client.login(account['username'])
+        jobs.append((account, lambda client=client, account=account: job(client, account)))
+    return await tw.run_account_jobs(jobs)
+
+
+async def run_menu(accounts, count):
+    with open(tw.ACCOUNTS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(accounts, f)
+    answers = []
+    menu_picks = ['Continue to actions', 'Like tweets'] + ['Use saved session (cookies)'] * len(accounts) + ['Exit']
+    numbered_menu = tw.numbered_menu
+
+    def scripted_menu(prompt, choices):
+        answers.insert(0, str(choices.index(menu_picks.pop(0)) + 1))
+        return numbered_menu(prompt, choices)
+
+    def scripted_input(prompt=''):
+        if prompt.startswith('Enter number(s)'):
+            return str(len(accounts) + 1)
+        if prompt.startswith('Enter the search query'):
+            return 'bench'
+        if prompt.startswith('How many'):
+            return str(count)
+        if prompt.startswith('Enter delay'):
+            return str(DELAY)
+        return answers.pop(0)
+
+    tw.numbered_menu = scripted_menu
+    original_input = builtins.input
+    builtins.input = scripted_input
+    try:
+        await tw.main_menu()
+    finally:
+        tw.numbered_menu = numbered_menu
+        builtins.input = original_input
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_scenario(name, n, args):
+    accounts = make_accounts(n)
+    with scenario_state(args) as (clock, latencies, outcomes, clients):
+        tracemalloc.start()
+        started = time.perf_counter()
+        found = 0
+        if name == 'menu':
+            asyncio.run(run_menu(accounts, args.count))
+        else:
+            results = asyncio.run(run_action(action_jobs(args.count)[name], accounts, tw.make_client))
+            # search only returns how many tweets it found; it logs nothing
+            if name == 'search':
+                found = sum(r['result'] or 0 for r in results)
+        wall = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    ok = outcomes.count('ok') - (n if name == 'menu' else 0) + found  # menu logins are logged too
+    virtual = wall * args.scale
+    return {
+        'action': name, 'accounts': n, 'actions': ok, 'errors': outcomes.count('error'),
+        'wall_s': wall, 'virtual_s': virtual, 'per_min': ok / virtual * 60 if virtual else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000, 'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'api_calls': sum(sum(client.calls.values()) for client in clients), 'peak_mb': peak / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--accounts', default='1,10,100', help='comma-separated account counts')
+    parser.add_argument('--actions', default=None, help='comma-separated actions (default: all + menu)')
+    parser.add_argument('--scale', type=float, default=100.0, help='time compression factor')
+    parser.add_argument('--latency', type=float, default=0.2, help='fake API latency in (virtual) seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='injected transient error rate')
+    parser.add_argument('--count', type=int, default=5, help='targets per action')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+    names = args.actions.split(',') if args.actions else list(action_jobs(args.count)) + ['menu']
+    run_scenario('post', 1, args)  # warm-up: first-use imports and caches
+    results = [run_scenario(name, int(n), args) for name in names for n in args.accounts.split(',')]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f'time compressed {args.scale:g}x, fake latency {args.latency * 1000:g} ms, '
+          f'error rate {args.error_rate:g}, {args.count} targets per action, {DELAY} s delay')
+    print(f"{'action':>18} {'accts':>5} {'actions':>7} {'errors':>6} {'wall s':>7} {'virt s':>7} "
+          f"{'per min':>8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'calls':>6} {'peak MB':>7}")
+    for r in results:
+        print(f"{r['action']:>18} {r['accounts']:>5} {r['actions']:>7} {r['errors']:>6} {r['wall_s']:>7.2f} "
+              f"{r['virtual_s']:>7.0f} {r['per_min']:>8.1f} {r['p50_ms']:>7.0f} {r['p95_ms']:>7.0f} "
+              f"{r['p99_ms']:>7.0f} {r['api_calls']:>6} {r['peak_mb']:>7.2f}")
+    mean_rate = statistics.mean(r['per_min'] for r in results)
+    print(f'mean throughput {mean_rate:.1f} actions per virtual minute')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Per-action cost of the old open/append log_action vs ActionLogWriter.
+
+The old implementation opened twikit_log.txt, wrote one line and closed
+the file on every action, on the calling (event loop) thread. The new
+writer only appends the record to a buffer; a background thread batches
+the JSONL writes and rotates the file.
+
+Usage: python benchmarks/bench_log_writer.py [records]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from twitter_twikit import ActionLogWriter  # noqa: E402
+
+
+def legacy_log_action(msg, logfile):
+    with open(logfile, 'a', encoding='utf-8') as f:
+        f.write(f"[{datetime.now().isoformat()}] {msg}\n")
+
+
+def bench_legacy(directory, records):
+    path = os.path.join(directory, 'twikit_log.txt')
+    started = time.perf_counter()
+    for idx in range(records):
+        legacy_log_action(f'Liked tweet {1800000000000000000 + idx}', path)
+    return time.perf_counter() - started, time.perf_counter() - started
+
+
+def bench_writer(directory, records):
+    writer = ActionLogWriter(os.path.join(directory, 'twikit_log.jsonl'))
+    started = time.perf_counter()
+    for idx in range(records):
+        writer.write({
+            'ts': datetime.now().isoformat(),
+            'account': 'bench',
+            'action': 'like',
+            'target_id': str(1800000000000000000 + idx),
+            'latency_ms': 123.4,
+            'outcome': 'ok',
+            'message': f'Liked tweet {1800000000000000000 + idx}',
+        })
+    caller = time.perf_counter() - started
+    writer.close()
+    return caller, time.perf_counter() - started
+
+
+def main(records):
+    print(f'{records} records')
+    for name, bench in (('legacy', bench_legacy), ('buffered', bench_writer)):
+        with tempfile.TemporaryDirectory() as directory:
+            caller, total = bench(directory, records)
+        print(f'{name:>9}: {caller / records * 1e6:7.2f} us/action on the caller, '
+              f'{total:6.3f}s total including final flush')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,142 @@
+"""Peak memory of 10k-item actions: whole lists of twikit objects vs the pipeline.
+
+Each run happens in a fresh interpreter against fake_twikit.FakeClient with
+payloads=True, so search and retweeter results are real twikit Tweet/User
+objects around API-sized JSON (about 2.7 KB per tweet), with no latency or
+delay. Two scenarios: "like" (likes N search results) and "follow_retweeters"
+(follows N retweeters of one tweet). Each is run in these modes:
+
+* lists: the pattern the actions used to follow: every result is fetched
+  into one list of full objects first (list(tweets)[:count], the full users
+  from get_retweeters), then acted on
+* pipeline: the current like_tweets_twikit / follow_retweeters_twikit, which
+  project each page to compact records and pull them through the pipeline
+* rev: with --rev REV, the same actions from twitter_twikit.py at that git
+  revision (e.g. the commit before compact records)
+
+Reported: peak RSS of the process, and its growth over the RSS after imports.
+
+Usage: python benchmarks/bench_memory.py [--items 10000] [--rev REV] [--json]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+TWEET_URL = 'https://x.com/someone/status/1800000000000000001'
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+async def run_lists(tw, client, scenario, items):
+    tw.current_account.set('bench')
+    collected = []
+    cursor = None
+    while len(collected) < items:
+        if scenario == 'like':
+            page = await tw.api_call('search_tweet', lambda: client.search_tweet('bench', 'Latest', cursor=cursor))
+        else:
+            page = await tw.api_call('get_retweeters', lambda: client.get_retweeters('1', cursor=cursor))
+        collected.extend(page)
+        if not page.next_cursor:
+            break
+        cursor = page.next_cursor
+    done = 0
+    for item in list(collected)[:items]:
+        target = item.id
+        if scenario == 'like':
+            await tw.api_call('favorite_tweet', lambda: client.favorite_tweet(target))
+            tw.mark_done('like', target)
+            tw.log_action(f'Liked tweet {target}', action='like', target_id=target)
+        else:
+            await tw.api_call('follow_user', lambda: client.follow_user(target))
+            tw.mark_done('follow', target)
+            tw.log_action(f'Followed retweeter {target}', action='follow', target_id=target)
+        done += 1
+    return done
+
+
+async def run_actions(tw, client, scenario, items):
+    tw.current_account.set('bench')
+    if scenario == 'like':
+        return await tw.like_tweets_twikit(client, 'bench', items, 0)
+    return await tw.follow_retweeters_twikit(client, TWEET_URL, items, 0)
+
+
+def child(args):
+    # One measurement; prints a JSON line
+    if args.module_dir:
+        sys.path.insert(0, args.module_dir)
+    sys.path.insert(1, ROOT)
+    import fake_twikit
+    import twikit  # noqa: F401  imported up front so the baseline includes it
+    import twitter_twikit as tw
+    tw.pacer = tw.Pacer(limits={})
+    baseline = peak_rss_mb()
+    # Distinct users for retweeters, so every one of them gets followed
+    client = fake_twikit.FakeClient(latency=0, jitter=0, results=args.items * 2, users=args.items * 4,
+                                    payloads=True, seed=1)
+    run = run_lists if args.mode == 'lists' else run_actions
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        done = asyncio.run(run(tw, client, args.scenario, args.items))
+        if tw._log_writer is not None:
+            tw._log_writer.close()
+    print(json.dumps({'done': done, 'baseline_mb': baseline, 'peak_mb': peak_rss_mb()}))
+
+
+def measure(scenario, mode, items, module_dir=None):
+    command = [sys.executable, os.path.abspath(__file__), '--child', mode, '--scenario', scenario,
+               '--items', str(items)]
+    if module_dir:
+        command += ['--module-dir', module_dir]
+    with tempfile.TemporaryDirectory() as directory:
+        output = subprocess.run(command, cwd=directory, check=True, capture_output=True, text=True).stdout
+    return dict(json.loads(output.splitlines()[-1]), scenario=scenario, mode=mode)
+
+
+def main(args):
+    results = []
+    with tempfile.TemporaryDirectory() as module_dir:
+        modes = ['lists', 'pipeline']
+        if args.rev:
+            source = subprocess.run(['git', 'show', f'{args.rev}:twitter_twikit.py'], cwd=ROOT, check=True,
+                                    capture_output=True, text=True).stdout
+            with open(os.path.join(module_dir, 'twitter_twikit.py'), 'w', encoding='utf-8') as f:
+                f.write(source)
+            modes.append('rev')
+        for scenario in ('like', 'follow_retweeters'):
+            for mode in modes:
+                results.append(measure(scenario, mode, args.items, module_dir if mode == 'rev' else None))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f'{args.items} items per run, fake payloads' + (f', rev = {args.rev}' if args.rev else ''))
+    print(f"{'scenario':>18} {'mode':>9} {'done':>6} {'peak MB':>8} {'growth MB':>9}")
+    for r in results:
+        print(f"{r['scenario']:>18} {r['mode']:>9} {r['done']:>6} {r['peak_mb']:>8.1f} "
+              f"{r['peak_mb'] - r['baseline_mb']:>9.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--rev', default=None, help='also measure twitter_twikit.py at this git revision')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    parser.add_argument('--child', dest='mode', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--scenario', default='like', help=argparse.SUPPRESS)
+    parser.add_argument('--module-dir', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.mode:
+        child(args)
+    else:
+        main(args)
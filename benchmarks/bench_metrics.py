@@ -0,0 +1,68 @@
+"""Per-call overhead of the metrics layer in api_call.
+
+Runs api_call around an instant no-op request with metrics enabled and
+disabled (the pacer is given an endpoint without limits, so it never waits),
+then times writing the JSON and Prometheus snapshots for a run's worth of
+accounts and endpoints.
+
+Usage: python benchmarks/bench_metrics.py [calls] [accounts]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import twitter_twikit as tw  # noqa: E402
+
+ENDPOINTS = ('create_tweet', 'favorite_tweet', 'retweet', 'follow_user', 'search_tweet')
+
+
+async def no_op():
+    return None
+
+
+async def bench_calls(calls, accounts):
+    started = time.perf_counter()
+    for idx in range(calls):
+        tw.current_account.set(f'bench{idx % accounts}')
+        await tw.api_call('bench', no_op)
+    return (time.perf_counter() - started) / calls
+
+
+def main(calls, accounts):
+    tw.log_action = lambda *args, **kwargs: None
+    results = {}
+    for enabled in (False, True):
+        tw.metrics = tw.Metrics(enabled=enabled)
+        tw.metrics.written_at = float('inf') if not enabled else time.monotonic()
+        tw.metrics.interval = float('inf')
+        tw.pacer = tw.Pacer(limits={})
+        results[enabled] = asyncio.run(bench_calls(calls, accounts))
+    print(f'{calls} api_call()s over {accounts} accounts')
+    print(f'  metrics off: {results[False] * 1e6:6.2f} us/call')
+    print(f'  metrics on:  {results[True] * 1e6:6.2f} us/call '
+          f'(+{(results[True] - results[False]) * 1e6:.2f} us)')
+
+    metrics = tw.Metrics()
+    for idx in range(accounts):
+        for endpoint in ENDPOINTS:
+            labels = (('account', f'bench{idx}'), ('endpoint', endpoint))
+            metrics.count('twikit_api_calls_total', labels + (('outcome', 'ok'),))
+            metrics.observe('twikit_api_latency_seconds', labels, 0.3)
+            metrics.observe('twikit_wait_seconds', labels + (('reason', 'delay'),), 150)
+    with tempfile.TemporaryDirectory() as directory:
+        metrics.json_file = os.path.join(directory, 'metrics.json')
+        metrics.prom_file = os.path.join(directory, 'metrics.prom')
+        started = time.perf_counter()
+        metrics.write()
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(metrics.prom_file) + os.path.getsize(metrics.json_file)
+    print(f'  snapshot for {accounts} accounts x {len(ENDPOINTS)} endpoints: '
+          f'{elapsed * 1000:.1f} ms, {size / 1024:.0f} KiB')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100)
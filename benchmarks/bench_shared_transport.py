@@ -0,0 +1,118 @@
+"""Compare per-action twikit HTTP clients with one shared keep-alive pool.
+
+Starts a local HTTPS stand-in server with a throwaway self-signed
+certificate (needs the ``openssl`` command), then replays the same
+accounts x actions x requests workload twice:
+
+* ``per-action``: a fresh ``httpx.AsyncClient`` per action, as main_menu
+  used to build a new ``Client('en-US')`` for every account and action.
+* ``shared``: one cookie jar per account on top of one ``PooledTransport``.
+
+Usage: python benchmarks/bench_shared_transport.py [accounts] [actions] [requests]
+"""
+import asyncio
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from twitter_twikit import PooledTransport  # noqa: E402
+
+RESPONSE = (
+    b'HTTP/1.1 200 OK\r\n'
+    b'Content-Type: application/json\r\n'
+    b'Content-Length: 2\r\n'
+    b'Connection: keep-alive\r\n'
+    b'\r\n{}'
+)
+
+
+def make_certificate(directory):
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+         '-subj', '/CN=localhost', '-keyout', key, '-out', cert],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+
+class StandInServer:
+    def __init__(self, cert, key):
+        self.context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self.context.load_cert_chain(cert, key)
+        self.connections = 0
+        self.server = None
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                if not head:
+                    break
+                writer.write(RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0, ssl=self.context)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def per_action(url, accounts, actions, requests):
+    for _ in range(actions):
+        async def run_account():
+            async with httpx.AsyncClient(verify=False) as client:
+                for _ in range(requests):
+                    await client.get(url)
+        await asyncio.gather(*(run_account() for _ in range(accounts)))
+
+
+async def shared(url, accounts, actions, requests):
+    transport = PooledTransport(verify=False)
+    clients = [httpx.AsyncClient(transport=transport) for _ in range(accounts)]
+    for _ in range(actions):
+        async def run_account(client):
+            for _ in range(requests):
+                await client.get(url)
+        await asyncio.gather(*(run_account(c) for c in clients))
+    await transport.aclose()
+    return transport.stats()
+
+
+async def main(accounts, actions, requests):
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = make_certificate(directory)
+        total = accounts * actions * requests
+        print(f'{accounts} accounts x {actions} actions x {requests} requests = {total} requests')
+        for name, workload in (('per-action', per_action), ('shared', shared)):
+            server = StandInServer(cert, key)
+            port = await server.start()
+            started = time.perf_counter()
+            stats = await workload(f'https://127.0.0.1:{port}/', accounts, actions, requests)
+            elapsed = time.perf_counter() - started
+            await server.stop()
+            line = f'{name:>10}: {elapsed:7.3f}s, {server.connections:5d} TLS handshakes (server side)'
+            if stats:
+                line += f", {stats['reused']} reused requests"
+            print(line)
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:4]]
+    args += [10, 5, 4][len(args):]
+    asyncio.run(main(*args))
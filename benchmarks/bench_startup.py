@@ -0,0 +1,73 @@
+"""Time from starting twitter_twikit.py to its first prompt.
+
+Each run starts a fresh interpreter on the script (in an empty working
+directory, so no accounts or state files are read), waits until the
+account menu asks "Select an option", then closes stdin. For comparison it
+also times a bare interpreter and one that only imports the packages the
+script used to load eagerly (twikit, httpx, rich).
+
+Pass --max-ms to fail (exit 1) when the median time to the first prompt is
+above a budget, e.g. in CI.
+
+Usage: python benchmarks/bench_startup.py [runs] [--max-ms N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'twitter_twikit.py')
+PROMPT = b'Select an option'
+
+
+def time_to_prompt(directory):
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, SCRIPT], cwd=directory, stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    output = b''
+    while PROMPT not in output:
+        chunk = os.read(proc.stdout.fileno(), 65536)
+        if not chunk:
+            raise RuntimeError(f'script exited before its first prompt: {output[-500:]!r}')
+        output += chunk
+    elapsed = time.perf_counter() - started
+    proc.stdin.close()
+    proc.stdout.close()
+    proc.wait(timeout=10)
+    return elapsed
+
+
+def time_command(code):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], check=True)
+    return time.perf_counter() - started
+
+
+def median_ms(samples):
+    return statistics.median(samples) * 1000
+
+
+def main(runs, max_ms):
+    with tempfile.TemporaryDirectory() as directory:
+        prompt = [time_to_prompt(directory) for _ in range(runs)]
+    bare = [time_command('pass') for _ in range(runs)]
+    eager = [time_command('import twikit, httpx, rich.console') for _ in range(runs)]
+    print(f'{runs} runs (median)')
+    print(f'  bare interpreter:            {median_ms(bare):7.1f} ms')
+    print(f'  import twikit/httpx/rich:    {median_ms(eager):7.1f} ms')
+    print(f'  twitter_twikit first prompt: {median_ms(prompt):7.1f} ms')
+    if max_ms is not None and median_ms(prompt) > max_ms:
+        print(f'FAIL: first prompt took longer than {max_ms} ms')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('runs', nargs='?', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=None)
+    args = parser.parse_args()
+    sys.exit(main(args.runs, args.max_ms))
@@ -0,0 +1,271 @@
+# Local stand-in for twikit.Client, for benchmarks and dry runs without real
+# accounts or a network connection. Only the calls twitter_twikit.py makes are
+# implemented. Every call waits `latency` seconds (plus jitter) on the given
+# sleep function, can fail at a configurable rate per endpoint, and search /
+# retweeter / timeline results are paginated with cursors like twikit's Result.
+# With payloads=True, reads return real twikit Tweet/User objects built around
+# API-sized JSON payloads, for measuring memory as with the real client.
+import asyncio
+import collections
+import hashlib
+import itertools
+import random
+import time
+
+# Error kinds that can be injected, mapped onto twikit.errors class names
+ERROR_KINDS = {
+    'transient': 'ServerError',
+    'timeout': 'RequestTimeout',
+    'rate_limited': 'TooManyRequests',
+    'auth_expired': 'Unauthorized',
+    'permanent': 'Forbidden',
+}
+
+ENDPOINTS = ('login', 'user', 'create_tweet', 'search_tweet', 'favorite_tweet',
+             'retweet', 'follow_user', 'get_retweeters', 'get_latest_timeline')
+
+_ids = itertools.count(1900000000000000000)
+TIMELINE_BASE_ID = 1850000000000000000
+
+class FakeUser:
+    __slots__ = ('id', 'name', 'screen_name')
+
+    def __init__(self, user_id, name):
+        self.id = str(user_id)
+        self.name = name
+        self.screen_name = name
+
+class FakeTweet:
+    __slots__ = ('id', 'text', 'user', 'created_at')
+
+    def __init__(self, tweet_id, text, user):
+        self.id = str(tweet_id)
+        self.text = text
+        self.user = user
+        self.created_at = time.strftime('%a %b %d %H:%M:%S +0000 %Y', time.gmtime())
+
+def user_payload(user_id, name):
+    # The shape of a GraphQL user result, with the fields twikit.User reads
+    return {
+        '__typename': 'User', 'id': f'VXNlcjo{user_id}', 'rest_id': str(user_id),
+        'affiliates_highlighted_label': {}, 'has_graduated_access': True, 'is_blue_verified': False,
+        'profile_image_shape': 'Circle',
+        'legacy': {
+            'can_dm': False, 'can_media_tag': True, 'created_at': 'Tue Mar 21 20:50:14 +0000 2006',
+            'default_profile': False, 'default_profile_image': False,
+            'description': f'Posting about software, open source and whatever else {name} finds interesting.',
+            'entities': {'description': {'urls': []}, 'url': {'urls': [{
+                'display_url': 'example.com', 'expanded_url': 'https://example.com/',
+                'url': 'https://t.co/abcdefghij', 'indices': [0, 23]}]}},
+            'fast_followers_count': 0, 'favourites_count': 4821, 'followers_count': 1520, 'friends_count': 311,
+            'has_custom_timelines': True, 'is_translator': False, 'listed_count': 27, 'location': 'Earth',
+            'media_count': 96, 'name': name, 'normal_followers_count': 1520, 'pinned_tweet_ids_str': [],
+            'possibly_sensitive': False,
+            'profile_banner_url': f'https://pbs.twimg.com/profile_banners/{user_id}/1600000000',
+            'profile_image_url_https': f'https://pbs.twimg.com/profile_images/{user_id}/photo_normal.jpg',
+            'profile_interstitial_type': '', 'screen_name': name, 'statuses_count': 7342,
+            'translator_type': 'none', 'url': 'https://t.co/abcdefghij', 'verified': False,
+            'want_retweets': False, 'withheld_in_countries': [],
+        },
+        'professional': {'rest_id': str(user_id), 'professional_type': 'Creator', 'category': []},
+    }
+
+def tweet_payload(tweet_id, text, user_id, name):
+    # The shape of a GraphQL tweet result as search and timelines return it
+    return {
+        '__typename': 'Tweet', 'rest_id': str(tweet_id),
+        'core': {'user_results': {'result': user_payload(user_id, name)}},
+        'unmention_data': {}, 'edit_control': {'edit_tweet_ids': [str(tweet_id)],
+                                               'editable_until_msecs': '1700000000000', 'is_edit_eligible': True,
+                                               'edits_remaining': '5'},
+        'is_translatable': False, 'views': {'count': '1234', 'state': 'EnabledWithCount'},
+        'source': '<a href="https://mobile.twitter.com" rel="nofollow">Twitter Web App</a>',
+        'legacy': {
+            'bookmark_count': 3, 'bookmarked': False, 'created_at': 'Wed Oct 10 20:19:24 +0000 2018',
+            'conversation_id_str': str(tweet_id), 'display_text_range': [0, len(text)],
+            'entities': {'hashtags': [{'indices': [0, 7], 'text': 'python'}], 'symbols': [], 'timestamps': [],
+                         'urls': [{'display_url': 'example.com/post', 'expanded_url': 'https://example.com/post',
+                                   'url': 'https://t.co/klmnopqrst', 'indices': [8, 31]}],
+                         'user_mentions': [{'id_str': '12', 'name': 'someone', 'screen_name': 'someone',
+                                            'indices': [32, 40]}]},
+            'favorite_count': 42, 'favorited': False, 'full_text': text, 'is_quote_status': False,
+            'lang': 'en', 'possibly_sensitive': False, 'possibly_sensitive_editable': True,
+            'quote_count': 1, 'reply_count': 4, 'retweet_count': 7, 'retweeted': False,
+            'user_id_str': str(user_id), 'id_str': str(tweet_id),
+        },
+    }
+
+class FakeResponse:
+    # What favorite_tweet/retweet return: a bare response with rate-limit headers
+    def __init__(self, remaining, reset):
+        self.status_code = 200
+        self.headers = {'x-rate-limit-remaining': str(remaining), 'x-rate-limit-reset': str(reset)}
+
+class FakeResult(list):
+    # Mirrors twikit.utils.Result: a list of items plus next_cursor and next()
+    def __init__(self, items, next_cursor, fetch_next=None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self._fetch_next = fetch_next
+
+    async def next(self):
+        if self._fetch_next is None or self.next_cursor is None:
+            return FakeResult([], None)
+        return await self._fetch_next(self.next_cursor)
+
+class FakeClient:
+    # latency/jitter are in seconds of the `sleep` function's clock.
+    # error_rates maps an endpoint (or '*') to a failure probability and
+    # error_kind picks the twikit error raised (see ERROR_KINDS).
+    # rate_limits maps an endpoint to (requests, seconds); exceeding it raises
+    # TooManyRequests with a reset time, like the real API.
+    # The home timeline gains timeline_rate new tweets per minute of `clock`,
+    # newest (highest id) first, like the real one.
+    def __init__(self, language='en-US', latency=0.05, jitter=0.02, error_rates=None, error_kind='transient',
+                 results=200, page_size=20, users=50, rate_limits=None, timeline_rate=1.0, seed=None,
+                 payloads=False, clock=time.time, sleep=asyncio.sleep, **kwargs):
+        self.language = language
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rates = dict(error_rates or {})
+        self.error_kind = error_kind
+        self.results = results
+        self.page_size = page_size
+        self.users = users
+        self.rate_limits = dict(rate_limits or {})
+        self.timeline_rate = timeline_rate
+        self.random = random.Random(seed)
+        self.payloads = payloads
+        self.clock = clock
+        self.sleep = sleep
+        self.username = None
+        self.logged_in = False
+        self.calls = collections.Counter()
+        self.history = []  # (clock(), endpoint) per call, in call order
+        self.failures = collections.Counter()
+        self.windows = collections.defaultdict(collections.deque)
+        self.posted = []
+
+    async def _call(self, endpoint):
+        self.calls[endpoint] += 1
+        self.history.append((self.clock(), endpoint))
+        await self.sleep(max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)))
+        self._check_rate_limit(endpoint)
+        rate = self.error_rates.get(endpoint, self.error_rates.get('*', 0.0))
+        if rate and self.random.random() < rate:
+            self.failures[endpoint] += 1
+            raise self._error(self.error_kind, f'injected {self.error_kind} error on {endpoint}')
+
+    def _check_rate_limit(self, endpoint):
+        if endpoint not in self.rate_limits:
+            return
+        limit, seconds = self.rate_limits[endpoint]
+        now = self.clock()
+        window = self.windows[endpoint]
+        while window and window[0] <= now - seconds:
+            window.popleft()
+        if len(window) >= limit:
+            self.failures[endpoint] += 1
+            raise self._error('rate_limited', f'rate limit exceeded on {endpoint}',
+                              headers={'x-rate-limit-reset': str(int(window[0] + seconds) + 1)})
+        window.append(now)
+
+    def _error(self, kind, message, headers=None):
+        import twikit.errors
+        return getattr(twikit.errors, ERROR_KINDS[kind])(message, headers=headers)
+
+    def _user(self, seed):
+        number = int(hashlib.blake2b(str(seed).encode(), digest_size=4).hexdigest(), 16) % self.users
+        return FakeUser(1000 + number, f'fake_user_{number}')
+
+    def _page(self, key, make_item, cursor, count=None):
+        # Items are derived from (key, position), so every client sees the same pages
+        start = int(cursor or 0)
+        end = min(start + (count or self.page_size), self.results)
+        items = [make_item(key, position) for position in range(start, end)]
+        if self.payloads:
+            items = [self._twikit_object(item) for item in items]
+        next_cursor = str(end) if end < self.results else None
+        return items, next_cursor
+
+    def _twikit_object(self, item):
+        import twikit
+        if isinstance(item, FakeUser):
+            return twikit.User(self, user_payload(item.id, item.name))
+        data = tweet_payload(item.id, item.text, item.user.id, item.user.name)
+        return twikit.Tweet(self, data, twikit.User(self, data['core']['user_results']['result']))
+
+    # Session
+
+    async def login(self, auth_info_1, auth_info_2=None, password=None, totp_secret=None, cookies_file=None, **kwargs):
+        await self._call('login')
+        self.username = auth_info_1
+        self.logged_in = True
+
+    async def user(self):
+        await self._call('user')
+        return FakeUser(abs(hash(self.username)) % 10**9, self.username)
+
+    def set_cookies(self, cookies, clear_cookies=False):
+        self.logged_in = False
+
+    def save_cookies(self, path):
+        pass
+
+    def load_cookies(self, path):
+        pass
+
+    # Posting
+
+    async def create_tweet(self, text='', media_ids=None, poll_uri=None, reply_to=None, **kwargs):
+        await self._call('create_tweet')
+        tweet = FakeTweet(next(_ids), text, FakeUser(0, self.username or 'me'))
+        self.posted.append((tweet.id, reply_to))
+        return tweet
+
+    # Reads
+
+    def _search_item(self, key, position):
+        digest = int(hashlib.blake2b(f'{key}\0{position}'.encode(), digest_size=6).hexdigest(), 16)
+        return FakeTweet(1800000000000000000 + digest, f'{key} result {position}', self._user(digest))
+
+    async def search_tweet(self, query, product='Latest', count=20, cursor=None):
+        await self._call('search_tweet')
+        items, next_cursor = self._page(query, self._search_item, cursor, count)
+        return FakeResult(items, next_cursor, lambda c: self.search_tweet(query, product, count, c))
+
+    async def get_retweeters(self, tweet_id, count=40, cursor=None):
+        await self._call('get_retweeters')
+        items, next_cursor = self._page(tweet_id, lambda key, position: self._user(f'{key}\0{position}'), cursor, count)
+        return FakeResult(items, next_cursor, lambda c: self.get_retweeters(tweet_id, count, c))
+
+    def _timeline_item(self, top_id, position):
+        tweet_id = top_id - position
+        return FakeTweet(tweet_id, f'timeline tweet {tweet_id}', self._user(tweet_id))
+
+    async def get_latest_timeline(self, count=20, seen_tweet_ids=None, cursor=None):
+        await self._call('get_latest_timeline')
+        top_id = TIMELINE_BASE_ID + int(self.clock() * self.timeline_rate / 60)
+        items, next_cursor = self._page(top_id, self._timeline_item, cursor, count)
+        return FakeResult(items, next_cursor, lambda c: self.get_latest_timeline(count, seen_tweet_ids, c))
+
+    # Engagement
+
+    async def favorite_tweet(self, tweet_id):
+        await self._call('favorite_tweet')
+        return self._response('favorite_tweet')
+
+    async def retweet(self, tweet_id):
+        await self._call('retweet')
+        return self._response('retweet')
+
+    async def follow_user(self, user_id):
+        await self._call('follow_user')
+        return FakeUser(user_id, f'fake_user_{user_id}')
+
+    def _response(self, endpoint):
+        if endpoint not in self.rate_limits:
+            return FakeResponse(999, int(self.clock()) + 900)
+        limit, seconds = self.rate_limits[endpoint]
+        window = self.windows[endpoint]
+        return FakeResponse(max(0, limit - len(window)), int((window[0] if window else self.clock()) + seconds))
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import fake_twikit
+import twitter_twikit as tw
+
+
+def fake_clock(monkeypatch, start=1000.0):
+    now = [start]
+
+    async def sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(tw, 'pacer', tw.Pacer(limits={}, clock=lambda: now[0], sleep=sleep))
+    monkeypatch.setattr(tw, 'done_index', tw.DoneIndex(':memory:', seed=False))
+    monkeypatch.setattr(tw, 'read_cache', tw.TTLCache())
+    monkeypatch.setattr(tw, '_log_writer', tw.NullLogWriter())
+    return now
+
+
+def test_follow_only_plans_wait_for_the_delay(monkeypatch):
+    now = fake_clock(monkeypatch)
+    client = fake_twikit.FakeClient(latency=0, jitter=0, users=50, seed=1, clock=lambda: now[0])
+
+    async def main():
+        tw.current_account.set('acc')
+        # Every tweet is already retweeted, so each plan is a follow only
+        for tweet in await client.search_tweet('q', 'Latest'):
+            tw.mark_done('retweet', tweet.id)
+        client.history.clear()
+        return await tw.retweet_and_follow_twikit(client, 'q', 5, delay=100)
+
+    assert asyncio.run(main()) == 5
+    follows = [at for at, endpoint in client.history if endpoint == 'follow_user']
+    assert 'retweet' not in [endpoint for _, endpoint in client.history]
+    assert len(follows) == 5
+    assert all(later - earlier >= 100 for earlier, later in zip(follows, follows[1:]))
+
+
+def test_permanent_follow_failures_are_not_retried(monkeypatch):
+    now = fake_clock(monkeypatch)
+    client = fake_twikit.FakeClient(latency=0, jitter=0, users=2, seed=1, clock=lambda: now[0])
+    attempts = []
+
+    async def follow_user(user_id):
+        attempts.append(user_id)
+        raise ValueError('You are unable to follow more people at this time.')
+
+    client.follow_user = follow_user
+
+    async def main():
+        tw.current_account.set('acc')
+        return await tw.retweet_and_follow_twikit(client, 'q', 8, delay=0)
+
+    asyncio.run(main())
+    assert sorted(attempts) == ['1000', '1001']
+    assert client.calls['retweet'] == 8
@@ -1,27 +1,202 @@
 import os
 import sys
+import argparse
 import asyncio
+import bisect
+import collections
+import contextlib
+import atexit
+import contextvars
 from datetime import datetime, timedelta
 import time
 import getpass
+import gzip
+import hashlib
 import random
+import re
 import json
+import math
+import mmap
 import csv
-from twikit import Client
+import heapq
+import importlib.util
+import itertools
+import shutil
+import sqlite3
+import tempfile
+import threading
 
-# Optional: rich for color output
-try:
-    from rich.console import Console
-    console = Console()
-    def cprint(msg, style=None):
+# twikit (and the httpx it pulls in) takes most of the startup time, so it is
+# only imported once an account logs in or an API error has to be classified.
+def twikit_errors():
+    import twikit.errors
+    return twikit.errors
+
+# Optional: rich for color output. The console is created on first print.
+_console = None
+_ansi_enabled = None
+
+def enable_ansi():
+    # Classic Windows consoles only handle ANSI escapes once virtual terminal
+    # processing is switched on (Windows 10+); False when that is not possible
+    global _ansi_enabled
+    if _ansi_enabled is None:
+        _ansi_enabled = os.name != 'nt'
+        if not _ansi_enabled:
+            try:
+                import ctypes
+                kernel32 = ctypes.windll.kernel32
+                handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+                mode = ctypes.c_uint32()
+                if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+                    # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+                    _ansi_enabled = bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+            except (AttributeError, OSError):
+                _ansi_enabled = False
+    return _ansi_enabled
+
+def get_console():
+    # The rich Console, or False when rich is not installed. ANSI is enabled
+    # first, so on Windows rich detects it and clears with escapes.
+    global _console
+    if _console is None:
+        enable_ansi()
+        try:
+            from rich.console import Console
+            _console = Console()
+        except ImportError:
+            _console = False
+    return _console
+
+def cprint(msg, style=None):
+    console = get_console()
+    if console:
         console.print(msg, style=style)
-except ImportError:
-    def cprint(msg, style=None):
+    else:
         print(msg)
 
-def log_action(msg, logfile='twikit_log.txt'):
-    with open(logfile, 'a', encoding='utf-8') as f:
-        f.write(f"[{datetime.now().isoformat()}] {msg}\n")
+# Optional: tomllib (Python 3.11+) for TOML job files; JSON job files always work
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+# Action log: one JSON record per line, written in batches by a background
+# thread and rotated (gzip-compressed) once the file reaches LOG_MAX_BYTES.
+LOG_FILE = 'twikit_log.jsonl'
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_FLUSH_RECORDS = 200
+LOG_FLUSH_INTERVAL = 2.0
+EXPORT_STATE_FILE = 'twikit_log_export.state.json'
+LEGACY_LOG_FILE = 'twikit_log.txt'
+
+# The account the current task is acting for, picked up by log_action
+current_account = contextvars.ContextVar('current_account', default=None)
+# Outcome counts ('ok'/'error'/...) of the running account job, filled by log_action
+job_outcomes = contextvars.ContextVar('job_outcomes', default=None)
+
+class ActionLogWriter:
+    def __init__(self, path=LOG_FILE, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT,
+                 flush_records=LOG_FLUSH_RECORDS, flush_interval=LOG_FLUSH_INTERVAL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.cond = threading.Condition()
+        self.io_lock = threading.Lock()
+        self.closed = False
+        self.file = None
+        self.thread = threading.Thread(target=self._run, name='action-log-writer', daemon=True)
+        self.thread.start()
+
+    def write(self, record):
+        with self.cond:
+            self.buffer.append(record)
+            closed = self.closed
+            if len(self.buffer) >= self.flush_records:
+                self.cond.notify()
+        if closed:
+            self.flush()
+
+    def flush(self):
+        # io_lock keeps batches in order between flush() and the writer thread
+        with self.io_lock:
+            with self.cond:
+                batch, self.buffer = self.buffer, []
+            if batch:
+                self._write_batch(batch)
+
+    def close(self):
+        with self.cond:
+            if self.closed:
+                return
+            self.closed = True
+            self.cond.notify()
+        self.thread.join()
+        with self.io_lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def _run(self):
+        while True:
+            with self.cond:
+                if not self.closed and len(self.buffer) < self.flush_records:
+                    self.cond.wait(self.flush_interval)
+                closed = self.closed
+            self.flush()
+            if closed:
+                return
+
+    def _write_batch(self, batch):
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in batch).encode('utf-8')
+        if self.file is None:
+            self.file = open(self.path, 'ab')
+        if self.file.tell() and self.file.tell() + len(data) > self.max_bytes:
+            self._rotate()
+        self.file.write(data)
+        self.file.flush()
+
+    def _rotate(self):
+        self.file.close()
+        for idx in range(self.backup_count - 1, 0, -1):
+            src = f'{self.path}.{idx}.gz'
+            if os.path.exists(src):
+                os.replace(src, f'{self.path}.{idx + 1}.gz')
+        if self.backup_count > 0:
+            with open(self.path, 'rb') as fin, gzip.open(f'{self.path}.1.gz', 'wb') as fout:
+                shutil.copyfileobj(fin, fout)
+        os.remove(self.path)
+        self.file = open(self.path, 'ab')
+
+_log_writer = None
+
+def get_log_writer():
+    global _log_writer
+    if _log_writer is None:
+        _log_writer = ActionLogWriter()
+        atexit.register(_log_writer.close)
+    return _log_writer
+
+def log_action(msg, action=None, target_id=None, outcome='ok', latency=None, account=None):
+    outcomes = job_outcomes.get()
+    if outcomes is not None:
+        outcomes[outcome] += 1
+    if account is None:
+        account = current_account.get()
+    metrics.count('twikit_actions_total', (('account', account), ('action', action), ('outcome', outcome)))
+    get_log_writer().write({
+        'ts': datetime.now().isoformat(),
+        'account': account,
+        'action': action,
+        'target_id': str(target_id) if target_id is not None else None,
+        'latency_ms': round(latency * 1000, 1) if latency is not None else None,
+        'outcome': outcome,
+        'message': msg,
+    })
 
 def safe_input(prompt):
     try:
@@ -65,8 +240,90 @@ ASCII_ART = r'''
 
 MENU_SEPARATOR = "=" * 50
 
+# How many accounts run at the same time, and how many jobs one account may run at once
+MAX_CONCURRENT_ACCOUNTS = 10
+MAX_JOBS_PER_ACCOUNT = 1
+
+_account_slots = {}
+
+# Seconds before a pooled session is checked again with a cheap authenticated call
+SESSION_CHECK_INTERVAL = 600
+
+# Request the next page of search results while the last tweet of the current page is processed
+SEARCH_PREFETCH = True
+
+# Request budgets per endpoint as (requests, seconds), applied per account.
+# These are conservative estimates of Twitter's limits; a rate-limit response
+# always wins and pauses the endpoint until the reset time it reports.
+ENDPOINT_LIMITS = {
+    'create_tweet': (50, 1800),
+    'retweet': (50, 1800),
+    'favorite_tweet': (500, 86400),
+    'follow_user': (400, 86400),
+    'search_tweet': (50, 900),
+    'get_retweeters': (500, 900),
+    'get_latest_timeline': (500, 900),
+}
+RATE_LIMIT_FALLBACK_WAIT = 900  # when a rate-limit error carries no reset time
+
+# Retries with jittered exponential backoff (seconds), and the retry budget per run
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 60.0
+RETRY_BUDGET = 50
+
+# Progress files for bulk and thread jobs, used by "Resume interrupted jobs"
+JOBS_DIR = 'twikit_jobs'
+
+# Metrics snapshots (see Metrics); histogram buckets are in seconds
+METRICS_ENABLED = True
+METRICS_JSON_FILE = 'twikit_metrics.json'
+METRICS_PROM_FILE = 'twikit_metrics.prom'
+METRICS_WRITE_INTERVAL = 60
+METRICS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900, 3600)
+
+# Cross-account cache for search, timeline and retweeter pages (set
+# READ_CACHE_ENABLED = False to always hit the API)
+READ_CACHE_ENABLED = True
+READ_CACHE_TTL = 300
+READ_CACHE_MAX_ENTRIES = 256
+
+# Already-done index. Searches scan up to DONE_SCAN_FACTOR times the requested
+# count so that skipped targets do not shrink the number of actions.
+DONE_INDEX_DB = 'twikit_done.db'
+DONE_INDEX_CAPACITY = 1_000_000
+DONE_INDEX_ERROR_RATE = 0.01
+DONE_SCAN_FACTOR = 5
+DONE_ACTIONS = ('like', 'retweet', 'follow')
+
+# One keep-alive connection pool shared by every account client. Cookies and
+# headers still live on each account's own client.
+SHARED_HTTP_POOL = True
+HTTP_POOL_MAX_CONNECTIONS = 20
+HTTP_POOL_MAX_KEEPALIVE = 10
+HTTP_POOL_KEEPALIVE_EXPIRY = 60
+HTTP_POOL_HTTP2 = None  # None = use HTTP/2 when the h2 package is installed
+
+_shared_transport = None
+
+# Scheduled posts are kept in SQLite so they survive restarts.
+# MISSED_POST_POLICY decides what happens to posts that came due while the tool
+# was not running: 'post' posts them on startup, 'skip' marks them missed, and
+# 'grace' posts them only if they are at most MISSED_POST_GRACE seconds late.
+SCHEDULE_DB = 'twikit_schedule.db'
+MISSED_POST_POLICY = 'grace'
+MISSED_POST_GRACE = 3600
+
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # Without a subprocess: rich's clear (a no-op when output is piped to a
+    # file), or without rich an ANSI clear + cursor home on a terminal that
+    # understands it
+    console = get_console()
+    if console:
+        console.clear()
+    elif sys.stdout.isatty() and enable_ansi():
+        sys.stdout.write('\033[2J\033[H')
+        sys.stdout.flush()
 
 def print_banner():
     clear_screen()
@@ -77,15 +334,96 @@ def print_banner():
 
 # Account management helpers
 
-def load_accounts():
-    if not os.path.exists(ACCOUNTS_FILE):
-        return []
-    with open(ACCOUNTS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+class AccountStore:
+    # accounts.json (a list of account dicts) behind an in-memory index keyed by
+    # name. The file is parsed again only when it changed on disk (inode, size or
+    # mtime), and every write goes to a temp file that then replaces it, so a
+    # crash mid-write never leaves a truncated file. Callers get copies, so
+    # changes only stick through put/update/remove.
+    def __init__(self, path=ACCOUNTS_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.accounts = {}
+        self.stamp = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _refresh(self):
+        stamp = self._stat()
+        if stamp == self.stamp:
+            return
+        accounts = {}
+        if stamp is not None:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                loaded = json.load(f)
+            taken = {account['name'] for account in loaded}
+            for account in loaded:
+                name = account['name']
+                if name in accounts:
+                    # Older versions allowed repeated names; keep every
+                    # account, the later ones under a numbered name that
+                    # the next write saves
+                    number = 2
+                    while f'{name} ({number})' in taken:
+                        number += 1
+                    taken.add(f'{name} ({number})')
+                    account = dict(account, name=f'{name} ({number})')
+                    cprint(f"[yellow]{self.path} has more than one account named {name}; "
+                           f"{account['username']} is now listed as {account['name']}.[/]")
+                accounts[account['name']] = account
+        self.accounts = accounts
+        self.stamp = stamp
+
+    def _save(self):
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(list(self.accounts.values()), f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.stamp = self._stat()
+
+    def all(self):
+        with self.lock:
+            self._refresh()
+            return [dict(account) for account in self.accounts.values()]
+
+    def get(self, name):
+        with self.lock:
+            self._refresh()
+            account = self.accounts.get(name)
+            return dict(account) if account is not None else None
+
+    def put(self, account):
+        with self.lock:
+            self._refresh()
+            self.accounts[account['name']] = dict(account)
+            self._save()
+
+    def update(self, name, **fields):
+        # Returns False (and writes nothing) when there is no such account
+        with self.lock:
+            self._refresh()
+            if name not in self.accounts:
+                return False
+            self.accounts[name].update(fields)
+            self._save()
+            return True
 
-def save_accounts(accounts):
-    with open(ACCOUNTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(accounts, f, indent=2)
+    def remove(self, name):
+        with self.lock:
+            self._refresh()
+            account = self.accounts.pop(name, None)
+            if account is not None:
+                self._save()
+            return account
+
+account_store = AccountStore()
 
 def select_accounts_menu(accounts):
     if not accounts:
@@ -105,23 +443,26 @@ def select_accounts_menu(accounts):
             selected.append(accounts[int(s)-1])
     return selected
 
-def add_account_menu(accounts):
+def add_account_menu():
     name = safe_input("Account name (for your reference): ")
+    if account_store.get(name) is not None:
+        cprint(f'[red]An account named {name} already exists.[/]')
+        return
     username = safe_input("Twitter username: ")
     email = safe_input("Twitter email: ")
     password = safe_password("Twitter password: ")
     cookies_file = f"cookies_{username}.json"
-    accounts.append({
+    account_store.put({
         'name': name,
         'username': username,
         'email': email,
         'password': password,
         'cookies_file': cookies_file
     })
-    save_accounts(accounts)
     cprint(f'[green]Account {name} added![/]')
 
-def remove_account_menu(accounts):
+def remove_account_menu():
+    accounts = account_store.all()
     if not accounts:
         cprint('[red]No accounts to remove.[/]')
         return
@@ -130,14 +471,13 @@ def remove_account_menu(accounts):
         cprint(f"  {idx}. {acc['name']} ({acc['username']})")
     sel = safe_input(f"Enter number to remove (1-{len(accounts)}): ")
     if sel.isdigit() and 1 <= int(sel) <= len(accounts):
-        acc = accounts.pop(int(sel)-1)
-        save_accounts(accounts)
+        acc = account_store.remove(accounts[int(sel)-1]['name'])
         cprint(f'[yellow]Account {acc["name"]} removed.[/]')
     else:
         cprint('[red]Invalid selection.[/]')
 
 def account_management_menu():
-    accounts = load_accounts()
+    accounts = account_store.all()
     while True:
         print_banner()
         cprint('[bold blue]Account Management Menu[/]')
@@ -150,14 +490,14 @@ def account_management_menu():
                     cprint(f"  {idx}. {acc['name']} ({acc['username']})")
             safe_input("Press Enter to continue...")
         elif choice == "Add account":
-            add_account_menu(accounts)
+            add_account_menu()
             safe_input("Press Enter to continue...")
         elif choice == "Remove account":
-            remove_account_menu(accounts)
+            remove_account_menu()
             safe_input("Press Enter to continue...")
         elif choice == "Continue to actions":
             break
-        accounts = load_accounts()  # reload in case of changes
+        accounts = account_store.all()  # only re-read if the file changed
     return accounts
 
 def collect_user_input():
@@ -165,11 +505,15 @@ def collect_user_input():
     menu_choices = [
         "Post a tweet",
         "Schedule a tweet",
+        "View scheduled tweets",
         "Tweet multiple tweets (bulk)",
         "Tweet a thread",
+        "Resume interrupted jobs",
         "Import tweets from CSV (bulk)",
         "Import tweets from CSV (thread)",
         "Export log to CSV",
+        "Query log",
+        "Log summary report",
         "Like tweets",
         "Retweet tweets",
         "Follow users",
@@ -217,13 +561,7 @@ async def login_twikit(client, account):
         if 'email' in account:
             del account['email']
         # Save updated credentials
-        accounts = load_accounts()
-        for acc in accounts:
-            if acc['name'] == account['name']:
-                acc['username'] = username
-                acc['password'] = password
-                acc['cookies_file'] = cookies_file
-        save_accounts(accounts)
+        account_store.update(account['name'], username=username, password=password, cookies_file=cookies_file)
     try:
         await client.login(
             auth_info_1=username,
@@ -232,260 +570,2013 @@ async def login_twikit(client, account):
             cookies_file=cookies_file
         )
         cprint(f'[green]Login successful for {username}![/]')
-        log_action(f'Login successful for {username}')
+        log_action(f'Login successful for {username}', action='login', account=account['name'])
     except Exception as e:
         cprint(f'[red]Login failed for {username}: {e}[/]')
-        log_action(f'Login failed for {username}: {e}')
+        log_action(f'Login failed for {username}: {e}', action='login', outcome='error', account=account['name'])
         sys.exit(1)
 
+async def login_saved_session(client, account):
+    # Non-interactive login from the saved cookies/credentials, for background work
+    username = account['username']
+    await client.login(
+        auth_info_1=username,
+        auth_info_2=account.get('email') or username,
+        password=account.get('password', ''),
+        cookies_file=account.get('cookies_file')
+    )
+    log_action(f'Login successful for {username}', action='login', account=account['name'])
+
+# Shared HTTP transport
+
+class PooledTransport:
+    # Wraps httpx's pooled transport and counts how many requests needed a new
+    # TCP connect / TLS handshake, so connection reuse can be reported.
+    # httpx only needs the transport interface, so this does not subclass
+    # httpx.AsyncBaseTransport and httpx is imported when the pool is built.
+    def __init__(self, http2=HTTP_POOL_HTTP2, max_connections=HTTP_POOL_MAX_CONNECTIONS,
+                 max_keepalive=HTTP_POOL_MAX_KEEPALIVE, keepalive_expiry=HTTP_POOL_KEEPALIVE_EXPIRY,
+                 **kwargs):
+        import httpx
+        if http2 is None:
+            http2 = importlib.util.find_spec('h2') is not None
+        self.http2 = http2
+        self.transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry
+            ),
+            **kwargs
+        )
+        self.requests = 0
+        self.tcp_connects = 0
+        self.tls_handshakes = 0
+
+    async def handle_async_request(self, request):
+        self.requests += 1
+        outer_trace = request.extensions.get('trace')
+
+        async def trace(event_name, info):
+            if event_name == 'connection.connect_tcp.complete':
+                self.tcp_connects += 1
+            elif event_name == 'connection.start_tls.complete':
+                self.tls_handshakes += 1
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions['trace'] = trace
+        return await self.transport.handle_async_request(request)
+
+    async def __aenter__(self):
+        await self.transport.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.transport.__aexit__(*exc_info)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'tcp_connects': self.tcp_connects,
+            'tls_handshakes': self.tls_handshakes,
+            'reused': self.requests - self.tcp_connects,
+            'http2': self.http2,
+        }
+
+    def print_stats(self):
+        stats = self.stats()
+        cprint(f"[cyan]HTTP pool: {stats['requests']} requests over {stats['tcp_connects']} connections "
+               f"({stats['reused']} reused, {stats['tls_handshakes']} TLS handshakes, "
+               f"{'HTTP/2' if stats['http2'] else 'HTTP/1.1'}).[/]")
+
+def shared_transport():
+    global _shared_transport
+    if _shared_transport is None:
+        _shared_transport = PooledTransport()
+    return _shared_transport
+
+def make_client(shared_pool=None):
+    from twikit import Client
+    if shared_pool is None:
+        shared_pool = SHARED_HTTP_POOL
+    if shared_pool:
+        return Client('en-US', transport=shared_transport())
+    return Client('en-US')
+
+class SessionPool:
+    # Keeps one logged-in client per account for the whole program run, so each
+    # account is only prompted and logged in once no matter how many actions run.
+    def __init__(self, check_interval=SESSION_CHECK_INTERVAL, interactive=True, shared_pool=None):
+        self.check_interval = check_interval
+        self.interactive = interactive
+        self.shared_pool = shared_pool
+        self.clients = {}
+        self.accounts = {}
+        self.checked_at = {}
+        self.hits = 0
+        self.misses = 0
+        self.reauths = 0
+
+    async def get(self, account):
+        key = account['name']
+        client = self.clients.get(key)
+        if client is not None:
+            self.hits += 1
+            if time.monotonic() - self.checked_at[key] >= self.check_interval:
+                if not await self.is_valid(client):
+                    await self.reauthenticate(client, account)
+                self.checked_at[key] = time.monotonic()
+            return client
+        self.misses += 1
+        client = make_client(self.shared_pool)
+        if self.interactive:
+            await login_twikit(client, account)
+        else:
+            await login_saved_session(client, account)
+        self.clients[key] = client
+        self.accounts[key] = account
+        self.checked_at[key] = time.monotonic()
+        return client
+
+    async def refresh(self, account_name):
+        # Re-login after the API rejected the session mid-run
+        client = self.clients.get(account_name)
+        if client is None:
+            raise KeyError(f'no pooled session for {account_name}')
+        await self.reauthenticate(client, self.accounts[account_name])
+        self.checked_at[account_name] = time.monotonic()
+
+    async def is_valid(self, client):
+        # One cheap authenticated request; only auth errors mean the cookies expired.
+        try:
+            await client.user()
+            return True
+        except (twikit_errors().Unauthorized, twikit_errors().Forbidden):
+            return False
+        except Exception:
+            return True
+
+    async def reauthenticate(self, client, account):
+        self.reauths += 1
+        username = account['username']
+        cprint(f'[yellow]Session expired for {username}, logging in again...[/]')
+        client.set_cookies({}, clear_cookies=True)
+        try:
+            await client.login(
+                auth_info_1=username,
+                auth_info_2=account.get('email') or username,
+                password=account.get('password', '')
+            )
+            if account.get('cookies_file'):
+                client.save_cookies(account['cookies_file'])
+            cprint(f'[green]Re-login successful for {username}![/]')
+            log_action(f'Re-login successful for {username}', action='login', account=account['name'])
+        except Exception as e:
+            cprint(f'[red]Re-login failed for {username}: {e}[/]')
+            log_action(f'Re-login failed for {username}: {e}', action='login', outcome='error', account=account['name'])
+            raise
+
+    def print_stats(self):
+        cprint(f'[cyan]Session pool: {self.hits} hits, {self.misses} misses '
+               f'({self.hits} logins saved), {self.reauths} re-logins.[/]')
+
+session_pool = SessionPool()
+
+# Already-done index: (account, action, target id) for every like, retweet and
+# follow that succeeded, so repeated runs skip them before any API call. A Bloom
+# filter in memory answers most "not done yet" lookups without touching SQLite.
+# The same database keeps per-account paging positions (cursors) so a later
+# run can continue a listing where the previous one stopped.
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=DONE_INDEX_ERROR_RATE):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(self.size // 8 + 1)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+class DoneIndex:
+    def __init__(self, path=DONE_INDEX_DB, seed=True):
+        # seed=False skips importing the existing log into a new index
+        self.path = path
+        self.seed = seed
+        self.db = None
+        self.bloom = None
+        self.skipped = 0
+
+    def open(self):
+        if self.db is not None:
+            return
+        new = not os.path.exists(self.path)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS done (account TEXT NOT NULL, action TEXT NOT NULL, target_id TEXT NOT NULL, "
+            "done_at REAL NOT NULL, PRIMARY KEY (account, action, target_id)) WITHOUT ROWID"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS cursors (account TEXT NOT NULL, kind TEXT NOT NULL, key TEXT NOT NULL, "
+            "cursor TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (account, kind, key)) WITHOUT ROWID"
+        )
+        self._load_bloom()
+        if new and self.seed:
+            seeded = sum(self.seed_from_log(path) for path in (LEGACY_LOG_FILE, LOG_FILE) if os.path.exists(path))
+            if seeded:
+                cprint(f'[cyan]Seeded the already-done index with {seeded} entries from the log.[/]')
+
+    def _load_bloom(self):
+        rows = self.db.execute("SELECT COUNT(*) FROM done").fetchone()[0]
+        self.bloom = BloomFilter(max(DONE_INDEX_CAPACITY, rows * 2))
+        for account, action, target_id in self.db.execute("SELECT account, action, target_id FROM done"):
+            self.bloom.add(f'{account}\0{action}\0{target_id}')
+
+    def contains(self, account, action, target_id):
+        self.open()
+        key = f'{account}\0{action}\0{target_id}'
+        if key not in self.bloom:
+            return False
+        return self.db.execute(
+            "SELECT 1 FROM done WHERE account = ? AND action = ? AND target_id = ?",
+            (account, action, str(target_id))
+        ).fetchone() is not None
+
+    def add(self, account, action, target_id):
+        self.add_many([(account, action, target_id)])
+
+    def add_many(self, entries):
+        self.open()
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO done (account, action, target_id, done_at) VALUES (?, ?, ?, ?)",
+                ((account, action, str(target_id), now) for account, action, target_id in entries)
+            )
+        for account, action, target_id in entries:
+            self.bloom.add(f'{account}\0{action}\0{target_id}')
+        if self.bloom.count > self.bloom.capacity:
+            self._load_bloom()
+
+    def get_cursor(self, account, kind, key):
+        self.open()
+        row = self.db.execute(
+            "SELECT cursor FROM cursors WHERE account = ? AND kind = ? AND key = ?", (account, kind, str(key))
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, account, kind, key, cursor):
+        # None forgets the position, so the next run starts from the top
+        self.open()
+        with self.db:
+            if cursor is None:
+                self.db.execute("DELETE FROM cursors WHERE account = ? AND kind = ? AND key = ?", (account, kind, str(key)))
+            else:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO cursors (account, kind, key, cursor, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (account, kind, str(key), cursor, time.time())
+                )
+
+    def seed_from_log(self, logfile):
+        # JSONL records carry the account. Old free-text lines do not, so they are
+        # credited to the account of the most recent "Login successful" line.
+        self.open()
+        usernames = {acc['username']: acc['name'] for acc in account_store.all()}
+        login_account = None
+        entries = []
+        for record, _ in iter_log_lines(logfile):
+            message = record.get('message') or ''
+            if record.get('action'):
+                if record.get('outcome') == 'ok' and record.get('account') and record.get('target_id') \
+                        and record['action'] in DONE_ACTIONS:
+                    entries.append((record['account'], record['action'], record['target_id']))
+                continue
+            match = LEGACY_LOGIN_LINE.match(message)
+            if match:
+                login_account = usernames.get(match.group(1), match.group(1))
+                continue
+            for pattern, action in LEGACY_DONE_LINES:
+                match = pattern.match(message)
+                if match and login_account:
+                    entries.append((login_account, action, match.group(1)))
+                    break
+            if len(entries) >= 10000:
+                self.add_many(entries)
+                entries = []
+        self.add_many(entries)
+        return self.db.execute("SELECT COUNT(*) FROM done").fetchone()[0]
+
+done_index = DoneIndex()
+
+def mark_done(action, target_id):
+    done_index.add(current_account.get() or '-', action, target_id)
+
+# Metrics: counters and latency histograms tagged by account and endpoint or
+# action, for every API attempt, every pacer/backoff wait and every logged
+# action. Recording is a lock plus a dict update; snapshots are written as JSON
+# and Prometheus text at most every METRICS_WRITE_INTERVAL seconds and at the
+# end of each run.
+
+class Metrics:
+    def __init__(self, enabled=METRICS_ENABLED, buckets=METRICS_BUCKETS, json_file=METRICS_JSON_FILE,
+                 prom_file=METRICS_PROM_FILE, interval=METRICS_WRITE_INTERVAL):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.json_file = json_file
+        self.prom_file = prom_file
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.counters = collections.defaultdict(float)
+        self.histograms = {}
+        self.written_at = time.monotonic()
+
+    def count(self, name, labels, value=1):
+        # labels is a tuple of (key, value) pairs, in a fixed order per metric
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name, labels] += value
+
+    def observe(self, name, labels, seconds):
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[name, labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    def snapshot(self):
+        with self.lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            histograms = [{'name': name, 'labels': dict(labels), 'buckets': dict(zip(map(str, self.buckets), counts)),
+                           'overflow': counts[-1], 'sum': total, 'count': n}
+                          for (name, labels), (counts, total, n) in sorted(self.histograms.items())]
+        return {'ts': datetime.now().isoformat(), 'counters': counters, 'histograms': histograms}
+
+    def prometheus(self):
+        def fmt(labels):
+            return ','.join(f'{key}="{prometheus_escape(value)}"' for key, value in labels)
+
+        bounds = [f'{bound:g}' for bound in self.buckets] + ['+Inf']
+        lines = []
+        typed = set()
+        with self.lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f'# TYPE {name} counter')
+                # Whole counts exactly; repr keeps every digit of a float
+                sample = int(value) if float(value).is_integer() else repr(value)
+                lines.append(f'{name}{{{fmt(labels)}}} {sample}')
+            for (name, labels), (counts, total, n) in sorted(self.histograms.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f'# TYPE {name} histogram')
+                base = fmt(labels)
+                prefix = f'{name}_bucket{{{base},le="' if base else f'{name}_bucket{{le="'
+                # The last count is the overflow bucket, so the running total ends at n for +Inf
+                lines.extend(f'{prefix}{bound}"}} {cumulative}'
+                             for bound, cumulative in zip(bounds, itertools.accumulate(counts)))
+                lines.append(f'{name}_sum{{{base}}} {total:.6f}')
+                lines.append(f'{name}_count{{{base}}} {n}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        if not self.enabled:
+            return
+        self.written_at = time.monotonic()
+        for path, text in ((self.json_file, json.dumps(self.snapshot())), (self.prom_file, self.prometheus())):
+            tmp = f'{path}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp, path)
+
+    def maybe_write(self):
+        if self.enabled and time.monotonic() - self.written_at >= self.interval:
+            self.write()
+
+    def print_stats(self):
+        if not self.enabled:
+            return
+        with self.lock:
+            calls = sum(value for (name, _), value in self.counters.items() if name == 'twikit_api_calls_total')
+            network = sum(h[1] for (name, _), h in self.histograms.items() if name == 'twikit_api_latency_seconds')
+            waiting = sum(h[1] for (name, _), h in self.histograms.items() if name == 'twikit_wait_seconds')
+        if calls:
+            cprint(f'[cyan]Metrics: {int(calls)} API calls, {network:.1f} seconds on the network, '
+                   f'{waiting:.0f} seconds waiting (written to {self.prom_file}).[/]')
+
+def prometheus_escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+metrics = Metrics()
+
+# Pacing: a token bucket per (account, endpoint) from ENDPOINT_LIMITS, plus the
+# user's delay as a minimum gap between two calls to the same endpoint. A
+# rate-limit error pauses only that account's endpoint, exactly until the reset
+# time Twitter reports, so other endpoints keep their own pace.
+
+class Pacer:
+    def __init__(self, limits=ENDPOINT_LIMITS, clock=time.time, sleep=asyncio.sleep):
+        self.limits = limits
+        self.clock = clock
+        self.sleep = sleep
+        self.state = {}
+        self.rate_limited_count = 0
+
+    def _state(self, endpoint):
+        key = (current_account.get(), endpoint)
+        if key not in self.state:
+            capacity = self.limits.get(endpoint, (None, None))[0]
+            self.state[key] = {'tokens': capacity, 'updated_at': self.clock(), 'blocked_until': 0.0, 'last_call': None}
+        return self.state[key]
+
+    def _refill(self, endpoint, state):
+        capacity, period = self.limits.get(endpoint, (None, None))
+        if capacity is None:
+            return
+        now = self.clock()
+        state['tokens'] = min(capacity, state['tokens'] + (now - state['updated_at']) * capacity / period)
+        state['updated_at'] = now
+
+    async def space(self, endpoint, delay=None, label=None):
+        # Minimum gap since this account's last call to the endpoint; None means
+        # a random 120-240 s gap as before.
+        state = self._state(endpoint)
+        if state['last_call'] is None:
+            return
+        gap = delay if delay is not None else random.uniform(120, 240)
+        wait = state['last_call'] + gap - self.clock()
+        if wait > 0:
+            cprint(f'[yellow]Waiting {int(wait)} seconds before next {label or endpoint}...[/]')
+            self.record_wait(endpoint, 'delay', wait)
+            await self.sleep(wait)
+
+    def record_wait(self, endpoint, reason, seconds):
+        metrics.observe('twikit_wait_seconds', (('account', current_account.get()), ('endpoint', endpoint), ('reason', reason)), seconds)
+
+    def seed_last_call(self, endpoint, at):
+        # A resumed job's last call, so time passed while the tool was down counts toward the gap
+        state = self._state(endpoint)
+        if state['last_call'] is None or at > state['last_call']:
+            state['last_call'] = at
+
+    async def acquire(self, endpoint):
+        state = self._state(endpoint)
+        while True:
+            now = self.clock()
+            if state['blocked_until'] > now:
+                wait = state['blocked_until'] - now
+                cprint(f'[yellow]{endpoint} is rate limited, pausing {int(wait)} seconds until '
+                       f'{datetime.fromtimestamp(state["blocked_until"]):%H:%M:%S}...[/]')
+                self.record_wait(endpoint, 'rate_limit', wait)
+                await self.sleep(wait)
+                continue
+            if state['blocked_until']:
+                # The limit window has reset, so the full budget is available again
+                state['blocked_until'] = 0.0
+                state['tokens'] = self.limits.get(endpoint, (None, None))[0]
+                state['updated_at'] = now
+            self._refill(endpoint, state)
+            if state['tokens'] is None or state['tokens'] >= 1:
+                break
+            capacity, period = self.limits[endpoint]
+            wait = (1 - state['tokens']) * period / capacity
+            cprint(f'[yellow]Pacing {endpoint}: waiting {int(wait)} seconds for capacity...[/]')
+            self.record_wait(endpoint, 'capacity', wait)
+            await self.sleep(wait)
+        if state['tokens'] is not None:
+            state['tokens'] -= 1
+        state['last_call'] = self.clock()
+
+    def rate_limited(self, endpoint, error):
+        self.rate_limited_count += 1
+        state = self._state(endpoint)
+        reset = getattr(error, 'rate_limit_reset', None)
+        state['blocked_until'] = reset if reset else self.clock() + RATE_LIMIT_FALLBACK_WAIT
+        state['tokens'] = 0 if state['tokens'] is not None else None
+        log_action(f'Rate limited on {endpoint} until {datetime.fromtimestamp(state["blocked_until"]).isoformat()}',
+                   action=endpoint, outcome='rate_limited')
+
+    def observe(self, endpoint, result):
+        # Calls that return the raw httpx response expose the real remaining budget
+        httpx = sys.modules.get('httpx')
+        if httpx is None or not isinstance(result, httpx.Response):
+            return
+        remaining = result.headers.get('x-rate-limit-remaining')
+        reset = result.headers.get('x-rate-limit-reset')
+        if remaining is None or not remaining.isdigit():
+            return
+        state = self._state(endpoint)
+        if state['tokens'] is not None:
+            state['tokens'] = min(state['tokens'], int(remaining))
+            state['updated_at'] = self.clock()
+        if int(remaining) == 0 and reset and reset.isdigit():
+            state['blocked_until'] = int(reset)
+
+pacer = Pacer()
+
+# Retries. Failures are sorted into transient (network errors, timeouts, 5xx),
+# rate_limited, auth_expired and permanent. Everything but permanent is retried
+# with jittered exponential backoff, up to RETRY_MAX_ATTEMPTS per call and
+# RETRY_BUDGET retries per run.
+
+def classify_error(error):
+    import httpx
+    errors = twikit_errors()
+    if isinstance(error, errors.TooManyRequests):
+        return 'rate_limited'
+    if isinstance(error, errors.Unauthorized):
+        return 'auth_expired'
+    if isinstance(error, (errors.ServerError, errors.RequestTimeout, httpx.TransportError, asyncio.TimeoutError, ConnectionError)):
+        return 'transient'
+    return 'permanent'
+
+class RetryStats:
+    def __init__(self, budget=RETRY_BUDGET):
+        self.budget = budget
+        self.reset()
+
+    def reset(self):
+        self.remaining = self.budget
+        self.retries = collections.Counter()
+        self.retry_time = 0.0
+
+    def take(self, kind):
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        self.retries[kind] += 1
+        return True
+
+    def print_stats(self):
+        total = sum(self.retries.values())
+        if not total:
+            return
+        kinds = ', '.join(f'{kind} {n}' for kind, n in sorted(self.retries.items()))
+        cprint(f'[cyan]Retries: {total} ({kinds}), {int(self.retry_time)} seconds spent retrying, '
+               f'{self.remaining}/{self.budget} of the run budget left.[/]')
+
+retry_stats = RetryStats()
+
+# The session pool that owns the current task's clients, for re-login on auth errors
+active_session_pool = contextvars.ContextVar('active_session_pool', default=None)
+
+async def api_call(endpoint, call):
+    # Waits for the endpoint's capacity, then calls it, retrying failures that
+    # are worth retrying. call() must be re-callable (a lambda around the request).
+    attempt = 0
+    retry_started = None
+    while True:
+        await pacer.acquire(endpoint)
+        if retry_started is not None:
+            retry_stats.retry_time += pacer.clock() - retry_started
+            retry_started = None
+        labels = (('account', current_account.get()), ('endpoint', endpoint))
+        started = time.perf_counter()
+        try:
+            result = await call()
+        except Exception as e:
+            kind = classify_error(e)
+            metrics.observe('twikit_api_latency_seconds', labels, time.perf_counter() - started)
+            metrics.count('twikit_api_calls_total', labels + (('outcome', kind),))
+            attempt += 1
+            if kind == 'rate_limited':
+                # Block the endpoint until the reset even when this call gives up,
+                # so the next item does not walk straight into the limit
+                pacer.rate_limited(endpoint, e)
+            if kind == 'permanent' or attempt >= RETRY_MAX_ATTEMPTS or not retry_stats.take(kind):
+                raise
+            retry_started = pacer.clock()
+            if kind == 'rate_limited':
+                # The next acquire() pauses the endpoint until the reset
+                continue
+            if kind == 'auth_expired':
+                pool = active_session_pool.get() or session_pool
+                await pool.refresh(current_account.get())
+                continue
+            backoff = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+            cprint(f'[yellow]{endpoint} failed ({e}); retry {attempt}/{RETRY_MAX_ATTEMPTS - 1} in {backoff:.1f} seconds...[/]')
+            log_action(f'Retrying {endpoint} after transient error: {e}', action=endpoint, outcome='retry')
+            pacer.record_wait(endpoint, 'backoff', backoff)
+            await pacer.sleep(backoff)
+            continue
+        metrics.observe('twikit_api_latency_seconds', labels, time.perf_counter() - started)
+        metrics.count('twikit_api_calls_total', labels + (('outcome', 'ok'),))
+        metrics.maybe_write()
+        pacer.observe(endpoint, result)
+        return result
+
 async def post_tweet_twikit(client, tweet_content):
+    started = time.perf_counter()
     try:
-        await client.create_tweet(text=tweet_content)
+        tweet = await api_call('create_tweet', lambda: client.create_tweet(text=tweet_content))
         cprint('[bold green]Tweet posted successfully![/]')
-        log_action('Tweet posted')
+        log_action('Tweet posted', action='post', target_id=tweet.id, latency=time.perf_counter() - started)
     except Exception as e:
         cprint(f'[red]Failed to post tweet: {e}[/]')
-        log_action(f'Failed to post tweet: {e}')
+        log_action(f'Failed to post tweet: {e}', action='post', outcome='error', latency=time.perf_counter() - started)
 
-async def schedule_tweet_twikit(client, tweet_content, schedule_time):
+async def schedule_tweet_twikit(account, tweet_content, schedule_time):
     try:
         # Parse schedule_time string
         dt = datetime.strptime(schedule_time, "%Y-%m-%d %H:%M")
-        now = datetime.now()
-        wait_seconds = (dt - now).total_seconds()
-        if wait_seconds > 0:
-            cprint(f'[yellow]Waiting until {dt} to post tweet...[/]')
-            time.sleep(wait_seconds)
-        await client.create_tweet(text=tweet_content)
-        cprint('[bold green]Scheduled tweet posted successfully![/]')
-        log_action(f'Scheduled tweet posted at {dt}')
+        post_id = get_schedule_dispatcher().schedule(account, tweet_content, dt.timestamp())
+        cprint(f'[green]Tweet #{post_id} scheduled for {dt} ({account["name"]}).[/]')
+        log_action(f'Scheduled tweet #{post_id} for {dt}', action='schedule', target_id=post_id, account=account['name'])
     except Exception as e:
         cprint(f'[red]Failed to schedule tweet: {e}[/]')
-        log_action(f'Failed to schedule tweet: {e}')
+        log_action(f'Failed to schedule tweet: {e}', action='schedule', outcome='error', account=account['name'])
 
-async def bulk_tweets_twikit(client, tweet_list, delay=None):
+async def bulk_tweets_twikit(client, tweet_list, delay=None, account=None, checkpoint=None):
+    # tweet_list may be any iterable (e.g. a CSV stream) of strings or CsvTweet rows.
+    # Rows with a scheduled time are queued for `account` instead of posted now.
+    # With a checkpoint, tweets it already covers are skipped and progress is saved.
     posted = 0
-    for idx, tweet_content in enumerate(tweet_list, 1):
+    start = checkpoint.data['next_index'] if checkpoint else 0
+    for idx, item in enumerate(itertools.islice(tweet_list, start, None), start + 1):
+        tweet = item if isinstance(item, CsvTweet) else CsvTweet(item)
+        if tweet.scheduled_at and account is not None:
+            await schedule_tweet_twikit(account, tweet.text, tweet.scheduled_at)
+            if checkpoint:
+                checkpoint.advance(acted=False)
+            continue
+        await pacer.space('create_tweet', delay, 'tweet')
+        started = time.perf_counter()
+        posted_tweet = None
         try:
-            await client.create_tweet(text=tweet_content)
+            posted_tweet = await api_call('create_tweet', lambda: client.create_tweet(text=tweet.text, reply_to=tweet.reply_to))
             cprint(f'[green]Tweet #{idx} posted![/]')
-            log_action(f'Bulk tweet #{idx} posted')
+            log_action(f'Bulk tweet #{idx} posted', action='bulk_post', target_id=posted_tweet.id, latency=time.perf_counter() - started)
             posted += 1
         except Exception as e:
             cprint(f'[yellow]Could not post tweet #{idx}: {e}[/]')
-        if idx < len(tweet_list):
-            d = delay if delay is not None else random.uniform(120, 240)
-            cprint(f'[yellow]Waiting {int(d)} seconds before next tweet...[/]')
-            time.sleep(d)
+            log_action(f'Could not post bulk tweet #{idx}: {e}', action='bulk_post', outcome='error', latency=time.perf_counter() - started)
+        if checkpoint:
+            checkpoint.advance(posted_tweet.id if posted_tweet else None)
     cprint(f'[bold green]Posted {posted} tweets in bulk.[/]')
+    return posted
 
-async def thread_tweets_twikit(client, tweet_list, delay=None):
+async def thread_tweets_twikit(client, tweet_list, delay=None, reply_to=None, checkpoint=None, start=None):
+    # reply_to attaches the first tweet of the thread to an existing tweet.
+    # With a checkpoint, the first `start` tweets (default: what it already covers) are skipped.
     posted = 0
-    last_tweet_id = None
-    for idx, tweet_content in enumerate(tweet_list, 1):
+    last_tweet_id = reply_to
+    if start is None:
+        start = checkpoint.data['next_index'] if checkpoint else 0
+    for idx, tweet_content in enumerate(itertools.islice(tweet_list, start, None), start + 1):
+        await pacer.space('create_tweet', delay, 'tweet in thread')
+        started = time.perf_counter()
         try:
-            if last_tweet_id:
-                tweet = await client.reply_tweet(text=tweet_content, tweet_id=last_tweet_id)
-            else:
-                tweet = await client.create_tweet(text=tweet_content)
+            tweet = await api_call('create_tweet', lambda: client.create_tweet(text=tweet_content, reply_to=last_tweet_id))
             last_tweet_id = tweet.id
+            if checkpoint:
+                checkpoint.advance(tweet.id)
             cprint(f'[green]Thread tweet #{idx} posted![/]')
-            log_action(f'Thread tweet #{idx} posted')
+            log_action(f'Thread tweet #{idx} posted', action='thread_post', target_id=tweet.id, latency=time.perf_counter() - started)
             posted += 1
         except Exception as e:
             cprint(f'[yellow]Could not post thread tweet #{idx}: {e}[/]')
-        if idx < len(tweet_list):
-            d = delay if delay is not None else random.uniform(120, 240)
-            cprint(f'[yellow]Waiting {int(d)} seconds before next tweet in thread...[/]')
-            time.sleep(d)
+            log_action(f'Could not post thread tweet #{idx}: {e}', action='thread_post', outcome='error', latency=time.perf_counter() - started)
+            # Replying to an earlier tweet would break the thread, so stop here
+            cprint(f'[red]Stopping the thread after {posted} tweet(s).[/]')
+            if checkpoint:
+                checkpoint.stop(f'thread tweet #{idx} failed: {e}')
+            break
     cprint(f'[bold green]Posted {posted} tweets as a thread.[/]')
+    return posted
 
-async def search_tweets_twikit(client, query, count=1):
-    try:
-        tweets = await client.search_tweet(query, 'Latest')
-        tweets = list(tweets)[:count]
-        for idx, tweet in enumerate(tweets, 1):
-            cprint(f"[blue]Tweet #{idx} by {tweet.user.name}: {tweet.text}[/]")
-        return tweets
-    except Exception as e:
-        cprint(f'[red]Failed to search tweets: {e}[/]')
-        log_action(f'Failed to search tweets: {e}')
-        return []
+async def csv_threads_twikit(client, rows, delay=None, checkpoint=None):
+    # Adjacent rows sharing a thread_id form one thread; a file without that
+    # column is a single thread, as before.
+    posted = 0
+    resume_at = checkpoint.data['next_index'] if checkpoint else 0
+    numbered = enumerate(rows)
+    for thread_id, group in itertools.groupby(numbered, key=lambda item: item[1].thread_id):
+        group = list(itertools.dropwhile(lambda item: item[0] < resume_at, group))
+        if not group:
+            continue
+        first_index, first = group[0]
+        reply_to = first.reply_to
+        if checkpoint:
+            if first_index > resume_at or checkpoint.data['thread_id'] != thread_id:
+                checkpoint.data['last_tweet_id'] = None
+            # Resuming inside a thread keeps replying to its last posted tweet
+            reply_to = checkpoint.data['last_tweet_id'] or reply_to
+            checkpoint.data['thread_id'] = thread_id
+            checkpoint.data['next_index'] = first_index
+            checkpoint.data['status'] = 'running'
+        if thread_id:
+            cprint(f'[cyan]Posting thread {thread_id}...[/]')
+        posted += await thread_tweets_twikit(client, [row.text for _, row in group], delay,
+                                             reply_to=reply_to, checkpoint=checkpoint, start=0)
+        if checkpoint and checkpoint.data['status'] == 'stopped':
+            # Keep the rest of the file for "Resume interrupted jobs" instead of skipping past it
+            cprint('[yellow]CSV thread job paused; resume it from the main menu.[/]')
+            break
+    return posted
 
-async def like_tweets_twikit(client, query, count=1, delay=None):
-    tweets = await search_tweets_twikit(client, query, count)
-    liked = 0
-    for idx, tweet in enumerate(tweets, 1):
+# Read-through cache for search, timeline and retweeter pages. Entries expire
+# after READ_CACHE_TTL seconds and the least recently used one is evicted past
+# READ_CACHE_MAX_ENTRIES. Concurrent requests for the same page share one fetch,
+# so when several accounts run the same query only the first one hits the API.
+
+CachedPage = collections.namedtuple('CachedPage', ['items', 'next_cursor'])
+
+# Compact records: the fields the actions use from twikit's Tweet and User
+# objects, which otherwise keep the whole API payload alive. Pages are projected
+# to these as soon as they arrive, before they are cached or handed to an action.
+TweetRecord = collections.namedtuple('TweetRecord', ['id', 'user_id', 'user_name'])
+TweetText = collections.namedtuple('TweetText', ['id', 'user_id', 'user_name', 'text'])
+UserRecord = collections.namedtuple('UserRecord', ['id', 'name'])
+
+def tweet_record(tweet):
+    return TweetRecord(tweet.id, tweet.user.id, tweet.user.name)
+
+def tweet_text(tweet):
+    return TweetText(tweet.id, tweet.user.id, tweet.user.name, tweet.text)
+
+def user_record(user):
+    return UserRecord(user.id, user.name)
+
+# What waiters on an in-flight fetch get when the task fetching it was cancelled
+FETCH_CANCELLED = object()
+
+class TTLCache:
+    def __init__(self, ttl=READ_CACHE_TTL, max_entries=READ_CACHE_MAX_ENTRIES, enabled=READ_CACHE_ENABLED, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.clock = clock
+        self.entries = collections.OrderedDict()
+        self.inflight = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_fetch(self, key, fetch):
+        if not self.enabled:
+            return await fetch()
+        while True:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self.clock():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+            if key not in self.inflight:
+                break
+            value = await asyncio.shield(self.inflight[key])
+            if value is not FETCH_CANCELLED:
+                self.hits += 1
+                return value
+            # The task fetching it was cancelled; fetch it ourselves
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
         try:
-            await client.favorite_tweet(tweet.id)
-            cprint(f'[green]Liked tweet by {tweet.user.name}![/]')
-            log_action(f'Liked tweet {tweet.id}')
-            liked += 1
-        except Exception as e:
-            cprint(f'[yellow]Could not like tweet: {e}[/]')
-        if idx < len(tweets):
-            d = delay if delay is not None else random.uniform(120, 240)
-            cprint(f'[yellow]Waiting {int(d)} seconds before next like...[/]')
-            time.sleep(d)
-    cprint(f'[bold green]Liked {liked} tweets.[/]')
+            value = await fetch()
+        except asyncio.CancelledError:
+            # Only this consumer was cancelled; waiters must not inherit that
+            future.set_result(FETCH_CANCELLED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; nobody else has to retrieve it
+            raise
+        finally:
+            del self.inflight[key]
+        future.set_result(value)
+        self.entries[key] = (self.clock() + self.ttl, value)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return value
 
-async def retweet_tweets_twikit(client, query, count=1, delay=None):
-    tweets = await search_tweets_twikit(client, query, count)
-    retweeted = 0
-    for idx, tweet in enumerate(tweets, 1):
+    def print_stats(self):
+        lookups = self.hits + self.misses
+        if not self.enabled or not lookups:
+            return
+        cprint(f'[cyan]Read cache: {self.hits}/{lookups} hits ({self.hits / lookups:.0%}), {len(self.entries)} cached pages.[/]')
+
+read_cache = TTLCache()
+
+async def cached_page(key, fetch, project):
+    # fetch() returns a twikit Result; only its items, projected to records, and
+    # next cursor are cached so a page fetched by one account's client can be
+    # served to any account. The key must tell projections apart.
+    async def load():
+        result = await fetch()
+        return CachedPage(tuple(project(item) for item in result), result.next_cursor)
+    return await read_cache.get_or_fetch(key, load)
+
+async def iter_search_tweets(client, query, count=1, product='Latest', prefetch=SEARCH_PREFETCH, project=tweet_record,
+                             wanted=None):
+    # Follows the search cursor page by page and stops as soon as `count` tweets
+    # have been consumed. With prefetch, the next page is requested while the
+    # consumer works on the last tweet of the current one, unless wanted() says
+    # that tweet may be the last one the consumer needs. Yields project(tweet).
+    async def fetch(cursor):
+        started = time.perf_counter()
         try:
-            await client.retweet(tweet.id)
-            cprint(f'[green]Retweeted tweet by {tweet.user.name}![/]')
-            log_action(f'Retweeted tweet {tweet.id}')
-            retweeted += 1
+            return await cached_page(
+                ('search', query, product, cursor, project.__name__),
+                lambda: api_call('search_tweet', lambda: client.search_tweet(query, product, cursor=cursor)),
+                project,
+            )
         except Exception as e:
-            cprint(f'[yellow]Could not retweet: {e}[/]')
-        if idx < len(tweets):
-            d = delay if delay is not None else random.uniform(120, 240)
-            cprint(f'[yellow]Waiting {int(d)} seconds before next retweet...[/]')
-            time.sleep(d)
-    cprint(f'[bold green]Retweeted {retweeted} tweets.[/]')
+            cprint(f'[red]Failed to search tweets: {e}[/]')
+            log_action(f'Failed to search tweets: {e}', action='search', target_id=query, outcome='error', latency=time.perf_counter() - started)
+            return None
 
-async def follow_users_twikit(client, query, count=1, delay=None):
-    tweets = await search_tweets_twikit(client, query, count)
-    followed = 0
-    for idx, tweet in enumerate(tweets, 1):
+    if count <= 0:
+        return
+    yielded = 0
+    cursor = None
+    next_page = None
+    try:
+        page = await fetch(None)
+        while page is not None:
+            items = page.items
+            if not items:
+                return
+            more = page.next_cursor and page.next_cursor != cursor and yielded + len(items) < count
+            for idx, tweet in enumerate(items, 1):
+                if more and prefetch and idx == len(items) and (wanted is None or wanted() > 1):
+                    next_page = asyncio.ensure_future(fetch(page.next_cursor))
+                yield tweet
+                yielded += 1
+                if yielded >= count:
+                    return
+            if not more:
+                return
+            cursor = page.next_cursor
+            if next_page is not None:
+                page, next_page = await next_page, None
+            else:
+                page = await fetch(cursor)
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
+# Action pipeline. Every engagement action is a source of items (search,
+# timeline, retweeters), filters that drop or limit items (repeats,
+# already-done targets, a count), one action stage that makes the paced,
+# retried and timed API call, and sinks that see every outcome (log, metrics).
+# Sources and filters are async generators pulled by the action stage, so
+# nothing is fetched before the action is ready for it and a filter that stops
+# early (limit) stops the paging behind it too.
+
+Outcome = collections.namedtuple('Outcome', ['item', 'target_id', 'ok', 'error', 'latency'])
+PipelineResult = collections.namedtuple('PipelineResult', ['succeeded', 'failed', 'stopped'])
+# A listed item plus the cursor of the page it came from, for resumable sources
+PagedItem = collections.namedtuple('PagedItem', ['value', 'cursor'])
+
+def dedupe(key):
+    # Drops items whose key was already seen in this run
+    async def stage(items):
+        seen = set()
+        async with contextlib.aclosing(items):
+            async for item in items:
+                if key(item) in seen:
+                    continue
+                seen.add(key(item))
+                yield item
+    return stage
+
+def not_done(action, target, on_skip=None):
+    # Drops items whose target the current account already handled for `action`;
+    # on_skip(item) is called for each one dropped
+    async def stage(items):
+        account = current_account.get() or '-'
+        async with contextlib.aclosing(items):
+            async for item in items:
+                if done_index.contains(account, action, target(item)):
+                    done_index.skipped += 1
+                    cprint(f'[cyan]Skipping {target(item)}: already done ({action}).[/]')
+                    if on_skip is not None:
+                        on_skip(item)
+                    continue
+                yield item
+    return stage
+
+class Limit:
+    # Passes the first `count` items. A source given `wanted=limit.remaining`
+    # can tell whether the item it is about to yield may be the last one needed.
+    def __init__(self, count):
+        self.count = count
+        self.passed = 0
+
+    def remaining(self):
+        return self.count - self.passed
+
+    async def __call__(self, items):
+        if self.count <= 0:
+            return
+        async with contextlib.aclosing(items):
+            async for item in items:
+                yield item
+                self.passed += 1
+                if self.passed >= self.count:
+                    return
+
+class PipelineAction:
+    # The API call for one item: waits for the endpoint's delay, calls it through
+    # api_call and records the target as done on success.
+    def __init__(self, endpoint, call, target, delay=None, label=None, done_action=None):
+        self.endpoint = endpoint
+        self.call = call
+        self.target = target
+        self.delay = delay
+        self.label = label
+        self.done_action = done_action
+
+    async def run(self, item):
+        target_id = self.target(item)
+        await pacer.space(self.endpoint, self.delay, self.label)
+        started = time.perf_counter()
         try:
-            await client.follow_user(tweet.user.id)
-            cprint(f'[green]Followed user {tweet.user.name}![/]')
-            log_action(f'Followed user {tweet.user.id}')
-            followed += 1
+            await self.attempt(item)
         except Exception as e:
-            cprint(f'[yellow]Could not follow user: {e}[/]')
-        if idx < len(tweets):
-            d = delay if delay is not None else random.uniform(120, 240)
-            cprint(f'[yellow]Waiting {int(d)} seconds before next follow...[/]')
-            time.sleep(d)
-    cprint(f'[bold green]Followed {followed} users.[/]')
+            return Outcome(item, target_id, False, e, time.perf_counter() - started)
+        if self.done_action:
+            mark_done(self.done_action, target_id)
+        return Outcome(item, target_id, True, None, time.perf_counter() - started)
+
+    async def attempt(self, item):
+        await api_call(self.endpoint, lambda: self.call(item))
+
+def log_outcome(action, printed, logged, printed_error, logged_error):
+    # Formats get item, target and error, e.g. 'Liked tweet by {item.user_name}!'
+    def sink(outcome):
+        fields = {'item': outcome.item, 'target': outcome.target_id, 'error': outcome.error}
+        if outcome.ok:
+            cprint(f'[green]{printed.format(**fields)}[/]')
+            log_action(logged.format(**fields), action=action, target_id=outcome.target_id, latency=outcome.latency)
+        else:
+            cprint(f'[yellow]{printed_error.format(**fields)}[/]')
+            log_action(logged_error.format(**fields), action=action, target_id=outcome.target_id,
+                       outcome='error', latency=outcome.latency)
+    return sink
+
+def action_metrics(action):
+    # Whole-action latency (retries and rate-limit waits included), next to the
+    # per-attempt twikit_api_latency_seconds recorded by api_call
+    def sink(outcome):
+        metrics.observe('twikit_action_seconds', (('account', current_account.get()), ('action', action)), outcome.latency)
+    return sink
+
+async def run_pipeline(source, filters, action, sinks, stop_after=None):
+    # stop_after ends the run after that many successful actions; `stopped`
+    # tells whether that happened before the source ran out.
+    items = source
+    for stage in filters:
+        items = stage(items)
+    succeeded = failed = 0
+    async with contextlib.aclosing(items):
+        async for item in items:
+            outcome = await action.run(item)
+            for sink in sinks:
+                sink(outcome)
+            if outcome.ok:
+                succeeded += 1
+                if stop_after is not None and succeeded >= stop_after:
+                    return PipelineResult(succeeded, failed, True)
+            else:
+                failed += 1
+    return PipelineResult(succeeded, failed, False)
+
+def tweet_id(tweet):
+    return tweet.id
+
+def author_id(tweet):
+    return tweet.user_id
+
+async def search_tweets_twikit(client, query, count=1):
+    # Prints tweets as they stream in and returns how many were found
+    found = 0
+    async for tweet in iter_search_tweets(client, query, count, project=tweet_text):
+        found += 1
+        cprint(f"[blue]Tweet #{found} by {tweet.user_name}: {tweet.text}[/]")
+    return found
+
+async def like_tweets_twikit(client, query, count=1, delay=None):
+    wanted = Limit(count)
+    result = await run_pipeline(
+        iter_search_tweets(client, query, count * DONE_SCAN_FACTOR, wanted=wanted.remaining),
+        [not_done('like', tweet_id), wanted],
+        PipelineAction('favorite_tweet', lambda tweet: client.favorite_tweet(tweet.id), tweet_id, delay, 'like', 'like'),
+        [log_outcome('like', 'Liked tweet by {item.user_name}!', 'Liked tweet {target}',
+                     'Could not like tweet: {error}', 'Could not like tweet {target}: {error}'),
+         action_metrics('like')],
+    )
+    cprint(f'[bold green]Liked {result.succeeded} tweets.[/]')
+    return result.succeeded
+
+async def retweet_tweets_twikit(client, query, count=1, delay=None):
+    wanted = Limit(count)
+    result = await run_pipeline(
+        iter_search_tweets(client, query, count * DONE_SCAN_FACTOR, wanted=wanted.remaining),
+        [not_done('retweet', tweet_id), wanted],
+        PipelineAction('retweet', lambda tweet: client.retweet(tweet.id), tweet_id, delay, 'retweet', 'retweet'),
+        [log_outcome('retweet', 'Retweeted tweet by {item.user_name}!', 'Retweeted tweet {target}',
+                     'Could not retweet: {error}', 'Could not retweet tweet {target}: {error}'),
+         action_metrics('retweet')],
+    )
+    cprint(f'[bold green]Retweeted {result.succeeded} tweets.[/]')
+    return result.succeeded
+
+async def follow_users_twikit(client, query, count=1, delay=None):
+    wanted = Limit(count)
+    result = await run_pipeline(
+        iter_search_tweets(client, query, count * DONE_SCAN_FACTOR, wanted=wanted.remaining),
+        [dedupe(author_id), not_done('follow', author_id), wanted],
+        PipelineAction('follow_user', lambda tweet: client.follow_user(tweet.user_id), author_id, delay, 'follow', 'follow'),
+        [log_outcome('follow', 'Followed user {item.user_name}!', 'Followed user {target}',
+                     'Could not follow user: {error}', 'Could not follow user {target}: {error}'),
+         action_metrics('follow')],
+    )
+    cprint(f'[bold green]Followed {result.succeeded} users.[/]')
+    return result.succeeded
 
 async def reply_to_tweet_twikit(client, query, reply_text, count=1, delay=None):
-    tweets = await search_tweets_twikit(client, query, count)
-    replied = 0
-    for idx, tweet in enumerate(tweets, 1):
-        try:
-            await client.create_tweet(text=reply_text, reply_to=tweet.id)
-            cprint(f'[green]Replied to tweet by {tweet.user.name}![/]')
-            log_action(f'Replied to tweet {tweet.id}')
-            replied += 1
-        except Exception as e:
-            cprint(f'[yellow]Could not reply: {e}[/]')
-        if idx < len(tweets):
-            d = delay if delay is not None else random.uniform(120, 240)
-            cprint(f'[yellow]Waiting {int(d)} seconds before next reply...[/]')
-            time.sleep(d)
-    cprint(f'[bold green]Replied to {replied} tweets.[/]')
+    result = await run_pipeline(
+        iter_search_tweets(client, query, count),
+        [],
+        PipelineAction('create_tweet', lambda tweet: client.create_tweet(text=reply_text, reply_to=tweet.id), tweet_id, delay, 'reply'),
+        [log_outcome('reply', 'Replied to tweet by {item.user_name}!', 'Replied to tweet {target}',
+                     'Could not reply: {error}', 'Could not reply to tweet {target}: {error}'),
+         action_metrics('reply')],
+    )
+    cprint(f'[bold green]Replied to {result.succeeded} tweets.[/]')
+    return result.succeeded
 
 async def reply_to_tweet_url_twikit(client, tweet_url, reply_text):
+    tweet_id = tweet_url.rstrip('/').split('/')[-1]
+    started = time.perf_counter()
     try:
-        tweet_id = tweet_url.rstrip('/').split('/')[-1]
-        await client.create_tweet(text=reply_text, reply_to=tweet_id)
+        await api_call('create_tweet', lambda: client.create_tweet(text=reply_text, reply_to=tweet_id))
         cprint(f'[green]Replied to the tweet![/]')
-        log_action(f'Replied to tweet by URL {tweet_id}')
+        log_action(f'Replied to tweet by URL {tweet_id}', action='reply', target_id=tweet_id, latency=time.perf_counter() - started)
     except Exception as e:
         cprint(f'[yellow]Could not reply to tweet: {e}[/]')
-        log_action(f'Failed to reply to tweet by URL: {e}')
+        log_action(f'Failed to reply to tweet by URL: {e}', action='reply', target_id=tweet_id, outcome='error', latency=time.perf_counter() - started)
+
+# What retweet_and_follow still has to do for one tweet
+RetweetFollowPlan = collections.namedtuple('RetweetFollowPlan', ['tweet', 'retweet', 'follow'])
+
+def plan_retweet_follow(unfollowable):
+    # Follows collapse to one per author: once an author is followed (now or in
+    # an earlier run), their other tweets only need the retweet. The plan for a
+    # tweet is made after the previous tweet's calls finished, so a follow that
+    # failed transiently is planned again for the author's next tweet, while
+    # authors in `unfollowable` (a permanent failure this run) are not retried.
+    # Tweets with nothing left to do are dropped before they cost a delay.
+    async def stage(tweets):
+        account = current_account.get() or '-'
+        async with contextlib.aclosing(tweets):
+            async for tweet in tweets:
+                retweet = not done_index.contains(account, 'retweet', tweet.id)
+                follow = tweet.user_id not in unfollowable and not done_index.contains(account, 'follow', tweet.user_id)
+                if not retweet and not follow:
+                    done_index.skipped += 1
+                    cprint(f'[cyan]Skipping {tweet.id}: already retweeted and following or unable to follow {tweet.user_name}.[/]')
+                    continue
+                yield RetweetFollowPlan(tweet, retweet, follow)
+    return stage
+
+class RetweetAndFollow(PipelineAction):
+    # Sends the planned retweet and follow for a tweet at the same time. The
+    # outcome's error maps each failed part ('retweet', 'follow') to its
+    # exception, so one failing does not hide the other. Authors whose follow
+    # failed permanently go into `unfollowable`.
+    def __init__(self, client, delay=None, unfollowable=None):
+        super().__init__('retweet', None, lambda plan: plan.tweet.id, delay, 'retweet/follow')
+        self.client = client
+        self.unfollowable = unfollowable if unfollowable is not None else set()
+
+    async def run(self, plan):
+        tweet = plan.tweet
+        # The delay holds for every endpoint the plan calls, so a follow-only
+        # plan still waits for the previous follow
+        if plan.retweet:
+            await pacer.space('retweet', self.delay, self.label)
+        if plan.follow:
+            await pacer.space('follow_user', self.delay, self.label)
+        started = time.perf_counter()
+        parts = {}
+        if plan.retweet:
+            parts['retweet'] = api_call('retweet', lambda: self.client.retweet(tweet.id))
+        if plan.follow:
+            parts['follow'] = api_call('follow_user', lambda: self.client.follow_user(tweet.user_id))
+        results = await asyncio.gather(*parts.values(), return_exceptions=True)
+        errors = {part: result for part, result in zip(parts, results) if isinstance(result, Exception)}
+        if plan.retweet and 'retweet' not in errors:
+            mark_done('retweet', tweet.id)
+        if plan.follow and 'follow' not in errors:
+            mark_done('follow', tweet.user_id)
+        elif plan.follow and classify_error(errors['follow']) == 'permanent':
+            self.unfollowable.add(tweet.user_id)
+        return Outcome(plan, tweet.id, not errors, errors or None, time.perf_counter() - started)
+
+def log_retweet_follow(counts):
+    # One record per part; counts collects successful retweets and follows
+    def sink(outcome):
+        plan, errors = outcome.item, outcome.error or {}
+        tweet = plan.tweet
+        if plan.retweet and 'retweet' in errors:
+            cprint(f"[yellow]Could not retweet: {errors['retweet']}[/]")
+            log_action(f"Could not retweet tweet {tweet.id}: {errors['retweet']}", action='retweet_follow',
+                       target_id=tweet.id, outcome='error', latency=outcome.latency)
+        elif plan.retweet:
+            counts['retweet'] += 1
+            cprint(f'[green]Retweeted tweet by {tweet.user_name}![/]')
+            log_action(f'Retweeted tweet {tweet.id}', action='retweet_follow', target_id=tweet.id, latency=outcome.latency)
+        if plan.follow and 'follow' in errors:
+            cprint(f"[yellow]Could not follow {tweet.user_name}: {errors['follow']}[/]")
+            log_action(f"Could not follow user {tweet.user_id}: {errors['follow']}", action='retweet_follow',
+                       target_id=tweet.user_id, outcome='error', latency=outcome.latency)
+        elif plan.follow:
+            counts['follow'] += 1
+            cprint(f'[green]Followed {tweet.user_name}![/]')
+            log_action(f'Followed user {tweet.user_id}', action='retweet_follow', target_id=tweet.user_id, latency=outcome.latency)
+    return sink
 
 async def retweet_and_follow_twikit(client, query, count=1, delay=None):
-    tweets = await search_tweets_twikit(client, query, count)
-    interacted = 0
-    for idx, tweet in enumerate(tweets, 1):
+    counts = collections.Counter()
+    wanted = Limit(count)
+    unfollowable = set()
+    result = await run_pipeline(
+        iter_search_tweets(client, query, count * DONE_SCAN_FACTOR, wanted=wanted.remaining),
+        [plan_retweet_follow(unfollowable), wanted],
+        RetweetAndFollow(client, delay, unfollowable),
+        [log_retweet_follow(counts), action_metrics('retweet_follow')],
+    )
+    cprint(f"[bold green]Retweeted {counts['retweet']} tweets and followed {counts['follow']} users.[/]")
+    return result.succeeded
+
+async def iter_retweeters(client, tweet_id, cursor=None):
+    # Yields PagedItem(UserRecord, cursor of the page the user is on), following the
+    # retweeter cursor until the list ends. Pages go through the shared read cache.
+    while True:
+        page = await cached_page(('retweeters', tweet_id, cursor),
+                                 lambda: api_call('get_retweeters', lambda: client.get_retweeters(tweet_id, cursor=cursor)),
+                                 user_record)
+        for user in page.items:
+            yield PagedItem(user, cursor)
+        if not page.items or not page.next_cursor or page.next_cursor == cursor:
+            return
+        cursor = page.next_cursor
+
+def retweeter_id(item):
+    return item.value.id
+
+async def follow_retweeters_twikit(client, tweet_url, max_users=10, delay=None):
+    # Streams retweeters until max_users follows succeeded, skipping users this
+    # account already follows and repeats without an API call. The page reached
+    # is saved, so the next run for the same tweet continues from there; once
+    # the list is exhausted the next run starts from the top again.
+    tweet_id = tweet_url.rstrip('/').split('/')[-1]
+    account = current_account.get() or '-'
+    cursor = done_index.get_cursor(account, 'retweeters', tweet_id)
+    if cursor:
+        cprint(f'[cyan]Continuing the retweeters of {tweet_id} from where the last run stopped.[/]')
+    position = {'cursor': cursor}
+
+    def track_position(outcome):
+        position['cursor'] = outcome.item.cursor
+
+    followed = 0
+    if max_users > 0:
         try:
-            await client.retweet(tweet.id)
-            await client.follow_user(tweet.user.id)
-            cprint(f'[green]Retweeted and followed {tweet.user.name}![/]')
-            log_action(f'Retweeted and followed {tweet.user.id}')
-            interacted += 1
+            result = await run_pipeline(
+                iter_retweeters(client, tweet_id, cursor),
+                [dedupe(retweeter_id), not_done('follow', retweeter_id)],
+                PipelineAction('follow_user', lambda item: client.follow_user(item.value.id), retweeter_id, delay, 'follow', 'follow'),
+                [log_outcome('follow', 'Followed retweeter {item.value.name}!', 'Followed retweeter {target}',
+                             'Could not follow retweeter: {error}', 'Could not follow retweeter {target}: {error}'),
+                 action_metrics('follow'), track_position],
+                stop_after=max_users,
+            )
+            followed = result.succeeded
+            if not result.stopped:
+                position['cursor'] = None
         except Exception as e:
-            cprint(f'[yellow]Could not retweet and follow: {e}[/]')
-        if idx < len(tweets):
-            d = delay if delay is not None else random.uniform(120, 240)
-            cprint(f'[yellow]Waiting {int(d)} seconds before next retweet/follow...[/]')
-            time.sleep(d)
-    cprint(f'[bold green]Retweeted and followed {interacted} users.[/]')
+            cprint(f'[red]Could not get retweeters: {e}[/]')
+            log_action(f'Failed to get retweeters: {e}', action='get_retweeters', target_id=tweet_id, outcome='error')
+        done_index.set_cursor(account, 'retweeters', tweet_id, position['cursor'])
+    cprint(f'[bold green]Followed {followed} retweeters.[/]')
+    return followed
 
-async def follow_retweeters_twikit(client, tweet_url, max_users=10, delay=None):
-    try:
-        tweet_id = tweet_url.rstrip('/').split('/')[-1]
-        users = await client.get_retweeters(tweet_id)
-        followed = 0
-        for idx, user in enumerate(users, 1):
-            if followed >= max_users:
-                break
-            try:
-                await client.follow_user(user.id)
-                cprint(f'[green]Followed retweeter {user.name}![/]')
-                log_action(f'Followed retweeter {user.id}')
-                followed += 1
-            except Exception as e:
-                cprint(f'[yellow]Could not follow retweeter: {e}[/]')
-            if idx < len(users):
-                d = delay if delay is not None else random.uniform(120, 240)
-                cprint(f'[yellow]Waiting {int(d)} seconds before next follow...[/]')
-                time.sleep(d)
-        cprint(f'[bold green]Followed {followed} retweeters.[/]')
-    except Exception as e:
-        cprint(f'[red]Could not get retweeters: {e}[/]')
-        log_action(f'Failed to get retweeters: {e}')
+async def iter_timeline(client, count, cursor=None):
+    # Follows the latest-timeline cursor, newest tweets first. Timelines differ
+    # per account, so the account is part of the cache key.
+    while True:
+        page = await cached_page(('timeline', current_account.get(), count, cursor),
+                                 lambda: api_call('get_latest_timeline', lambda: client.get_latest_timeline(count=count, cursor=cursor)),
+                                 tweet_record)
+        for tweet in page.items:
+            yield tweet
+        if not page.items or not page.next_cursor or page.next_cursor == cursor:
+            return
+        cursor = page.next_cursor
 
 async def like_timeline_twikit(client, count=1, delay=None):
+    # Handles at most `count` tweets newer than the newest one an earlier run
+    # saw, and stops paging as soon as it reaches that tweet. Older tweets
+    # beyond the first `count` are left alone, as before. The saved position
+    # only moves past tweets that are settled (liked, or already done), and
+    # never past a failed like, so the next run tries that tweet again.
+    account = current_account.get() or '-'
+    newest_seen = done_index.get_cursor(account, 'timeline', 'latest')
+    settled = []
+    failed = []
+
+    async def until_seen(tweets):
+        async with contextlib.aclosing(tweets):
+            async for tweet in tweets:
+                if newest_seen and int(tweet.id) <= int(newest_seen):
+                    cprint('[cyan]Reached the timeline position of the last run.[/]')
+                    return
+                yield tweet
+
+    def track_position(outcome):
+        (settled if outcome.ok else failed).append(int(outcome.target_id))
+
+    liked = 0
     try:
-        tweets = await client.get_latest_timeline(count=count)
-        tweets = list(tweets)[:count]
-        liked = 0
-        for idx, tweet in enumerate(tweets, 1):
-            try:
-                await client.favorite_tweet(tweet.id)
-                cprint(f'[green]Liked timeline tweet by {tweet.user.name}![/]')
-                log_action(f'Liked timeline tweet {tweet.id}')
-                liked += 1
-            except Exception as e:
-                cprint(f'[yellow]Could not like timeline tweet: {e}[/]')
-            if idx < len(tweets):
-                d = delay if delay is not None else random.uniform(120, 240)
-                cprint(f'[yellow]Waiting {int(d)} seconds before next like...[/]')
-                time.sleep(d)
+        result = await run_pipeline(
+            iter_timeline(client, count),
+            [until_seen, Limit(count), not_done('like', tweet_id, lambda tweet: settled.append(int(tweet.id)))],
+            PipelineAction('favorite_tweet', lambda tweet: client.favorite_tweet(tweet.id), tweet_id, delay, 'like', 'like'),
+            [log_outcome('like', 'Liked timeline tweet by {item.user_name}!', 'Liked timeline tweet {target}',
+                         'Could not like timeline tweet: {error}', 'Could not like timeline tweet {target}: {error}'),
+             action_metrics('like'), track_position],
+        )
+        liked = result.succeeded
         cprint(f'[bold green]Liked {liked} timeline tweets.[/]')
     except Exception as e:
         cprint(f'[red]Failed to fetch or like timeline tweets: {e}[/]')
-        log_action(f'Failed to like timeline tweets: {e}')
+        log_action(f'Failed to like timeline tweets: {e}', action='timeline', outcome='error')
+    if failed:
+        settled = [tweet_id for tweet_id in settled if tweet_id < min(failed)]
+    if settled and (newest_seen is None or max(settled) > int(newest_seen)):
+        done_index.set_cursor(account, 'timeline', 'latest', str(max(settled)))
+    return liked
+
+# Scheduled posts
+
+class ScheduleStore:
+    def __init__(self, path=SCHEDULE_DB):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS scheduled_posts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                account TEXT NOT NULL,
+                text TEXT NOT NULL,
+                due_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                created_at REAL NOT NULL,
+                done_at REAL,
+                result TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_scheduled_posts_pending ON scheduled_posts (status, due_at);
+            """
+        )
+
+    def add(self, account_name, text, due_at):
+        with self.lock, self.db:
+            cur = self.db.execute(
+                "INSERT INTO scheduled_posts (account, text, due_at, created_at) VALUES (?, ?, ?, ?)",
+                (account_name, text, due_at, time.time())
+            )
+            return cur.lastrowid
+
+    def pending(self):
+        with self.lock:
+            return self.db.execute(
+                "SELECT id, account, text, due_at FROM scheduled_posts WHERE status = 'pending' ORDER BY due_at"
+            ).fetchall()
+
+    def finish(self, post_id, status, result=None):
+        with self.lock, self.db:
+            self.db.execute(
+                "UPDATE scheduled_posts SET status = ?, done_at = ?, result = ? WHERE id = ?",
+                (status, time.time(), result, post_id)
+            )
+
+    def counts(self):
+        with self.lock:
+            return dict(self.db.execute("SELECT status, COUNT(*) FROM scheduled_posts GROUP BY status").fetchall())
+
+class ScheduleDispatcher:
+    # Runs on its own thread and event loop so the blocking menu prompts never
+    # delay a post. Pending posts sit in a heap ordered by due time and the loop
+    # only wakes up for the earliest one or when a new post is added.
+    def __init__(self, store, policy=MISSED_POST_POLICY, grace=MISSED_POST_GRACE):
+        self.store = store
+        self.policy = policy
+        self.grace = grace
+        self.heap = []
+        self.loop = None
+        self.wakeup = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.stopping = False
+        self.sessions = SessionPool(interactive=False, shared_pool=False)
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=lambda: asyncio.run(self._run()), name='schedule-dispatcher', daemon=True)
+        self.thread.start()
+        self.ready.wait()
+
+    def stop(self, timeout=5):
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.loop.call_soon_threadsafe(self.wakeup.set)
+        self.thread.join(timeout)
+        self.thread = None
+
+    def schedule(self, account, text, due_at):
+        post_id = self.store.add(account['name'], text, due_at)
+        self.start()
+        self.loop.call_soon_threadsafe(self._push, (due_at, post_id, account['name'], text))
+        return post_id
+
+    def _push(self, entry):
+        heapq.heappush(self.heap, entry)
+        self.wakeup.set()
+
+    def _catch_up(self):
+        now = time.time()
+        for post_id, account_name, text, due_at in self.store.pending():
+            late = now - due_at
+            if late > 0 and (self.policy == 'skip' or (self.policy == 'grace' and late > self.grace)):
+                self.store.finish(post_id, 'missed', f'{int(late)} seconds late on startup')
+                log_action(f'Scheduled tweet #{post_id} missed ({int(late)} seconds late)', action='scheduled_post', outcome='missed', account=account_name)
+                continue
+            self.heap.append((due_at, post_id, account_name, text))
+        heapq.heapify(self.heap)
+
+    async def _run(self):
+        self.loop = asyncio.get_running_loop()
+        self.wakeup = asyncio.Event()
+        self._catch_up()
+        self.ready.set()
+        tasks = set()
+        while not self.stopping:
+            self.wakeup.clear()
+            while self.heap and self.heap[0][0] <= time.time():
+                task = asyncio.create_task(self._post(*heapq.heappop(self.heap)))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            timeout = self.heap[0][0] - time.time() if self.heap else None
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _post(self, due_at, post_id, account_name, text):
+        account = account_store.get(account_name)
+        current_account.set(account_name)
+        active_session_pool.set(self.sessions)
+        started = time.perf_counter()
+        try:
+            if account is None:
+                raise ValueError(f'account {account_name} no longer exists')
+            client = await self.sessions.get(account)
+            tweet = await api_call('create_tweet', lambda: client.create_tweet(text=text))
+            self.store.finish(post_id, 'posted', tweet.id)
+            cprint(f'[bold green]Scheduled tweet #{post_id} posted for {account_name}![/]')
+            log_action(f'Scheduled tweet #{post_id} posted at {datetime.fromtimestamp(due_at)}', action='scheduled_post',
+                       target_id=tweet.id, latency=time.perf_counter() - started)
+        except Exception as e:
+            self.store.finish(post_id, 'failed', str(e))
+            cprint(f'[red]Scheduled tweet #{post_id} failed for {account_name}: {e}[/]')
+            log_action(f'Failed to post scheduled tweet #{post_id}: {e}', action='scheduled_post', outcome='error',
+                       latency=time.perf_counter() - started)
+
+    def pending_count(self):
+        return self.store.counts().get('pending', 0)
+
+_schedule_dispatcher = None
+
+def get_schedule_dispatcher():
+    global _schedule_dispatcher
+    if _schedule_dispatcher is None:
+        _schedule_dispatcher = ScheduleDispatcher(ScheduleStore())
+    return _schedule_dispatcher
+
+def show_scheduled_tweets():
+    store = get_schedule_dispatcher().store
+    rows = store.pending()
+    if not rows:
+        cprint('[yellow]No pending scheduled tweets.[/]')
+    for post_id, account_name, text, due_at in rows:
+        cprint(f"  #{post_id} {datetime.fromtimestamp(due_at):%Y-%m-%d %H:%M} {account_name}: {text}")
+    counts = store.counts()
+    cprint(f"[cyan]Pending: {counts.get('pending', 0)}, posted: {counts.get('posted', 0)}, "
+           f"failed: {counts.get('failed', 0)}, missed: {counts.get('missed', 0)}[/]")
 
 # CSV helpers
 
+# Optional columns are only read from files with a header row naming them;
+# a file without a header is one tweet per line in the first column, as before.
+CSV_COLUMNS = ('text', 'account', 'scheduled_at', 'thread_id', 'reply_to')
+CsvTweet = collections.namedtuple('CsvTweet', CSV_COLUMNS, defaults=(None,) * (len(CSV_COLUMNS) - 1))
+TWEET_MAX_LENGTH = 280
+
+def _csv_header(row):
+    names = [cell.strip().lower() for cell in row]
+    if 'text' in names and all(name in CSV_COLUMNS or not name for name in names):
+        return names
+    return None
+
+def iter_csv_tweets(path, account=None, skip_lines=()):
+    # Yields (line_number, CsvTweet) lazily; with `account`, only rows for that
+    # account or rows without a target account.
+    with open(path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        header = None
+        for row in reader:
+            line = reader.line_num
+            if line == 1:
+                header = _csv_header(row)
+                if header is not None:
+                    continue
+            if header is None:
+                fields = {'text': row[0] if row else ''}
+            else:
+                fields = {name: cell.strip() for name, cell in zip(header, row) if name}
+            text = (fields.pop('text', '') or '').strip()
+            if not text or line in skip_lines:
+                continue
+            tweet = CsvTweet(text, **{name: value or None for name, value in fields.items()})
+            if account is not None and tweet.account and tweet.account.lstrip('@') not in (account['name'], account['username']):
+                continue
+            yield line, tweet
+
+def csv_tweets_for_account(path, account, skip_lines=()):
+    return (tweet for _, tweet in iter_csv_tweets(path, account, skip_lines))
+
+def validate_csv_tweets(path):
+    # One pass over the file before anything is posted. Duplicates are detected
+    # per target account using 8-byte digests, so memory stays small.
+    stats = {'rows': 0, 'accounts': collections.Counter()}
+    problems = []
+    seen = set()
+    for line, tweet in iter_csv_tweets(path):
+        stats['rows'] += 1
+        stats['accounts'][tweet.account or '(all accounts)'] += 1
+        if len(tweet.text) > TWEET_MAX_LENGTH:
+            problems.append((line, f'tweet is {len(tweet.text)} characters (max {TWEET_MAX_LENGTH})'))
+        if tweet.scheduled_at:
+            try:
+                datetime.strptime(tweet.scheduled_at, "%Y-%m-%d %H:%M")
+            except ValueError:
+                problems.append((line, f'invalid scheduled_at {tweet.scheduled_at!r} (use YYYY-MM-DD HH:MM)'))
+        digest = hashlib.blake2b(f'{tweet.account}\0{tweet.text}'.encode('utf-8'), digest_size=8).digest()
+        if digest in seen:
+            problems.append((line, 'duplicate tweet'))
+        seen.add(digest)
+    return stats, problems
+
 def import_tweets_from_csv():
-    path = safe_input("Enter CSV file path (one tweet per line): ")
-    tweets = []
+    # Returns (path, skip_lines) after validating the file, or (None, None)
+    path = safe_input("Enter CSV file path (one tweet per line, or with a header: text,account,scheduled_at,thread_id,reply_to): ")
     try:
-        with open(path, newline='', encoding='utf-8') as csvfile:
-            reader = csv.reader(csvfile)
-            for row in reader:
-                if row and row[0].strip():
-                    tweets.append(row[0].strip())
-        cprint(f'[green]Imported {len(tweets)} tweets from {path}.[/]')
+        stats, problems = validate_csv_tweets(path)
     except Exception as e:
         cprint(f'[red]Failed to import CSV: {e}[/]')
-    return tweets
+        return None, None
+    per_account = ', '.join(f'{name}: {n}' for name, n in stats['accounts'].items())
+    cprint(f"[green]Checked {stats['rows']} tweets in {path} ({per_account}).[/]")
+    if problems:
+        for line, problem in problems[:20]:
+            cprint(f'[yellow]  line {line}: {problem}[/]')
+        if len(problems) > 20:
+            cprint(f'[yellow]  ... and {len(problems) - 20} more[/]')
+        choice = numbered_menu(f"{len(problems)} problem(s) found. Continue?", ["Skip those rows and continue", "Cancel"])
+        if choice == "Cancel":
+            return None, None
+    return path, {line for line, _ in problems}
+
+# Log export and queries. The log is read one line at a time (through mmap for
+# the live file, streamed for the gzip backups), so memory use does not grow
+# with the size of the log.
 
-def export_log_to_csv(logfile='twikit_log.txt', exportfile='twikit_log_export.csv'):
+LEGACY_LOG_LINE = re.compile(r'^\[(\d{4}-\d{2}-\d{2}T[\d:.]+)\] ?(.*)$')
+LEGACY_LOGIN_LINE = re.compile(r'^Login successful for (\S+)$')
+LEGACY_DONE_LINES = [
+    (re.compile(r'^Liked (?:timeline )?tweet (\d+)$'), 'like'),
+    (re.compile(r'^Retweeted tweet (\d+)$'), 'retweet'),
+    (re.compile(r'^Followed (?:user|retweeter) (\d+)$'), 'follow'),
+    (re.compile(r'^Retweeted and followed (\d+)$'), 'follow'),
+]
+LOG_FIELDS = ('ts', 'account', 'action', 'target_id', 'outcome', 'latency_ms', 'message')
+
+def parse_log_line(line):
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        try:
+            return json.loads(line)
+        except ValueError:
+            pass
+    # Lines written by the old free-text log_action
+    match = LEGACY_LOG_LINE.match(line)
+    if match:
+        return {'ts': match.group(1), 'message': match.group(2)}
+    return {'ts': None, 'message': line}
+
+def log_segments(logfile=LOG_FILE, backup_count=LOG_BACKUP_COUNT):
+    # The log's segments that exist, oldest first: gzip backups, then the live file
+    paths = [f'{logfile}.{idx}.gz' for idx in range(backup_count, 0, -1)] + [logfile]
+    return [path for path in paths if os.path.exists(path)]
+
+def log_segment_head(path):
+    # A hash of the segment's first line. Rotation moves the segment to a backup
+    # unchanged, so this follows it even when the new live file reuses the inode.
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        line = f.readline()
+    if not line.endswith(b'\n'):
+        return None
+    return hashlib.blake2b(line, digest_size=16).hexdigest()
+
+def iter_log_lines(logfile, start=0):
+    # Yields (record, offset just past the line) for every complete line from
+    # start on; offsets in a .gz backup are in the uncompressed data
+    if logfile.endswith('.gz'):
+        if not os.path.exists(logfile):
+            return
+        with gzip.open(logfile, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b'\n'):
+                    return
+                offset += len(line)
+                record = parse_log_line(line.decode('utf-8', errors='replace'))
+                if record is not None:
+                    yield record, offset
+        return
+    if not os.path.exists(logfile) or os.path.getsize(logfile) <= start:
+        return
+    with open(logfile, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mm.seek(start)
+        while True:
+            line = mm.readline()
+            if not line.endswith(b'\n'):
+                return  # end of file, or a line still being written
+            record = parse_log_line(line.decode('utf-8', errors='replace'))
+            if record is not None:
+                yield record, mm.tell()
+
+def _log_offset_for_time(logfile, since):
+    # The log is appended in time order, so bisect on line starts for the first
+    # record at or after `since` instead of scanning from the top.
+    if not os.path.exists(logfile) or os.path.getsize(logfile) == 0:
+        return 0
+    with open(logfile, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lo, hi = 0, len(mm)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line_start = mm.rfind(b'\n', 0, mid) + 1
+            line_end = mm.find(b'\n', line_start)
+            if line_end == -1:
+                hi = line_start
+                continue
+            record = parse_log_line(mm[line_start:line_end].decode('utf-8', errors='replace'))
+            ts = record.get('ts') if record else None
+            if ts is not None and ts < since:
+                lo = line_end + 1
+            else:
+                hi = line_start
+        return lo
+
+def query_log(logfile=LOG_FILE, since=None, until=None, account=None, action=None, legacy_file=LEGACY_LOG_FILE):
+    # since/until are datetimes; ISO timestamps compare correctly as strings.
+    # Covers the whole history in time order: the legacy text log, the gzip
+    # backups, then the live file.
+    since = since.isoformat() if since else None
+    until = until.isoformat() if until else None
+    segments = ([legacy_file] if legacy_file and os.path.exists(legacy_file) else []) + log_segments(logfile)
+    for path in segments:
+        start = _log_offset_for_time(path, since) if since and not path.endswith('.gz') else 0
+        for record, _ in iter_log_lines(path, start):
+            ts = record.get('ts')
+            if since and (ts is None or ts < since):
+                continue
+            if until and ts is not None and ts > until:
+                return
+            if account and record.get('account') != account:
+                continue
+            if action and record.get('action') != action:
+                continue
+            yield record
+
+def summarize_log(records):
+    summary = {}
+    for record in records:
+        key = (record.get('account') or '-', record.get('action') or '-')
+        row = summary.setdefault(key, {'ok': 0, 'error': 0, 'other': 0, 'latency_ms': 0.0, 'timed': 0})
+        outcome = record.get('outcome')
+        row[outcome if outcome in ('ok', 'error') else 'other'] += 1
+        if record.get('latency_ms') is not None:
+            row['latency_ms'] += record['latency_ms']
+            row['timed'] += 1
+    return summary
+
+def export_log_to_csv(logfile=LOG_FILE, exportfile='twikit_log_export.csv', statefile=EXPORT_STATE_FILE,
+                      legacy_file=LEGACY_LOG_FILE):
+    # Appends only the lines added since the last export. The state file remembers
+    # the segment the export reached (by log_segment_head) and the offset in it.
+    # After a rotation the rest of that segment is exported from its backup, then
+    # the newer segments; the export file is only started over when there is no
+    # usable state. Like query_log, the legacy text log is the oldest segment.
+    get_log_writer().flush()
     try:
-        with open(logfile, 'r', encoding='utf-8') as fin, open(exportfile, 'w', newline='', encoding='utf-8') as fout:
+        segments = ([legacy_file] if legacy_file and os.path.exists(legacy_file) else []) + log_segments(logfile)
+        if not segments:
+            cprint(f'[yellow]No log file {logfile} yet.[/]')
+            return
+        state = {}
+        if os.path.exists(statefile):
+            with open(statefile, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        heads = [log_segment_head(path) for path in segments]
+        same_files = (
+            state.get('logfile') == os.path.abspath(logfile)
+            and state.get('exportfile') == os.path.abspath(exportfile)
+            and state.get('head') is not None
+            and os.path.exists(exportfile)
+        )
+        if same_files and state['head'] in heads:
+            first, start = heads.index(state['head']), state.get('offset', 0)
+        else:
+            first, start = 0, 0
+            if same_files:
+                cprint('[yellow]The log rotated past its backups since the last export; '
+                       'appending everything that is left.[/]')
+        head, offset = state.get('head'), state.get('offset', 0)
+        exported = 0
+        with open(exportfile, 'a' if same_files else 'w', newline='', encoding='utf-8') as fout:
             writer = csv.writer(fout)
-            writer.writerow(['Timestamp', 'Message'])
-            for line in fin:
-                if line.strip():
-                    if line.startswith('['):
-                        ts, msg = line.split(']', 1)
-                        writer.writerow([ts.strip('[]'), msg.strip()])
-                    else:
-                        writer.writerow(['', line.strip()])
-        cprint(f'[green]Exported log to {exportfile}.[/]')
+            if not same_files:
+                writer.writerow(['Timestamp', 'Account', 'Action', 'Target', 'Outcome', 'Latency (ms)', 'Message'])
+            for idx in range(first, len(segments)):
+                segment_offset = start if idx == first else 0
+                for record, segment_offset in iter_log_lines(segments[idx], segment_offset):
+                    writer.writerow([record.get(key) for key in LOG_FIELDS])
+                    exported += 1
+                # An empty live file has no head yet; stay on the last segment that has one
+                if heads[idx] is not None:
+                    head, offset = heads[idx], segment_offset
+        with open(statefile, 'w', encoding='utf-8') as f:
+            json.dump({
+                'logfile': os.path.abspath(logfile),
+                'exportfile': os.path.abspath(exportfile),
+                'head': head,
+                'offset': offset,
+            }, f)
+        cprint(f'[green]Exported {exported} new log line(s) to {exportfile}.[/]')
     except Exception as e:
         cprint(f'[red]Failed to export log: {e}[/]')
 
+def parse_time_input(prompt):
+    value = safe_input(prompt).strip()
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M")
+    except ValueError:
+        cprint('[red]Invalid time, ignoring this filter.[/]')
+        return None
+
+def query_log_menu():
+    get_log_writer().flush()
+    since = parse_time_input("From (YYYY-MM-DD HH:MM, blank for start of log): ")
+    until = parse_time_input("Until (YYYY-MM-DD HH:MM, blank for end of log): ")
+    account = safe_input("Account name (blank for all): ").strip() or None
+    action = safe_input("Action, e.g. like, follow, retweet (blank for all): ").strip() or None
+    shown = 0
+    for record in query_log(since=since, until=until, account=account, action=action):
+        cprint(f"  {record.get('ts')} {record.get('account') or '-'} {record.get('action') or '-'} "
+               f"{record.get('outcome') or '-'}: {record.get('message')}")
+        shown += 1
+    cprint(f'[cyan]{shown} matching log line(s).[/]')
+
+def log_summary_menu():
+    get_log_writer().flush()
+    since = parse_time_input("From (YYYY-MM-DD HH:MM, blank for start of log): ")
+    until = parse_time_input("Until (YYYY-MM-DD HH:MM, blank for end of log): ")
+    summary = summarize_log(query_log(since=since, until=until))
+    if not summary:
+        cprint('[yellow]No log records in that range.[/]')
+        return
+    cprint(f"[bold]{'Account':<20} {'Action':<16} {'OK':>6} {'Errors':>6} {'Other':>6} {'Avg ms':>8}[/]")
+    for (account, action), row in sorted(summary.items()):
+        avg = f"{row['latency_ms'] / row['timed']:.0f}" if row['timed'] else '-'
+        cprint(f"{account:<20} {action:<16} {row['ok']:>6} {row['error']:>6} {row['other']:>6} {avg:>8}")
+
+# Checkpointed bulk and thread jobs. Progress is written to JOBS_DIR after every
+# tweet (atomically), so an interrupted job can be resumed where it stopped:
+# finished tweets are not posted again, a thread keeps replying to its last
+# tweet, and time that passed while the tool was down counts toward the delay.
+
+class JobCheckpoint:
+    active = set()
+
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+
+    @property
+    def id(self):
+        return self.data['id']
+
+    @classmethod
+    def create(cls, kind, account, delay, tweets=None, csv_path=None, skip_lines=()):
+        os.makedirs(JOBS_DIR, exist_ok=True)
+        job_id = f"{kind}-{re.sub(r'[^A-Za-z0-9_-]', '_', account['name'])}-{datetime.now():%Y%m%d-%H%M%S-%f}"
+        checkpoint = cls(os.path.join(JOBS_DIR, f'{job_id}.json'), {
+            'id': job_id,
+            'kind': kind,
+            'account': account['name'],
+            'delay': delay,
+            'tweets': tweets,
+            'csv_path': os.path.abspath(csv_path) if csv_path else None,
+            'skip_lines': sorted(skip_lines),
+            'status': 'running',
+            'next_index': 0,
+            'posted_ids': [],
+            'last_tweet_id': None,
+            'thread_id': None,
+            'last_action_at': None,
+            'created_at': time.time(),
+        })
+        checkpoint.save()
+        return checkpoint
+
+    @classmethod
+    def load_unfinished(cls):
+        if not os.path.isdir(JOBS_DIR):
+            return []
+        checkpoints = []
+        for name in sorted(os.listdir(JOBS_DIR)):
+            if name.endswith('.json'):
+                path = os.path.join(JOBS_DIR, name)
+                with open(path, 'r', encoding='utf-8') as f:
+                    checkpoint = cls(path, json.load(f))
+                if checkpoint.id not in cls.active:
+                    checkpoints.append(checkpoint)
+        return checkpoints
+
+    def save(self):
+        self.data['updated_at'] = time.time()
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def advance(self, tweet_id=None, acted=True):
+        self.data['next_index'] += 1
+        if tweet_id is not None:
+            self.data['posted_ids'].append(str(tweet_id))
+            self.data['last_tweet_id'] = str(tweet_id)
+        if acted:
+            self.data['last_action_at'] = time.time()
+        self.save()
+
+    def stop(self, reason):
+        self.data['status'] = 'stopped'
+        self.data['reason'] = reason
+        self.save()
+
+    def finish(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def source(self, account):
+        if self.data['csv_path']:
+            return csv_tweets_for_account(self.data['csv_path'], account, set(self.data['skip_lines']))
+        return self.data['tweets']
+
+    def describe(self):
+        done = self.data['next_index']
+        total = f"/{len(self.data['tweets'])}" if self.data['tweets'] is not None else ''
+        source = self.data['csv_path'] or 'manual tweets'
+        return f"{self.id}: {self.data['kind']} for {self.data['account']}, {done}{total} done ({source}, {self.data['status']})"
+
+async def run_checkpointed_job(client, account, checkpoint):
+    data = checkpoint.data
+    JobCheckpoint.active.add(checkpoint.id)
+    try:
+        if data['next_index']:
+            cprint(f"[cyan]Resuming {data['kind']} job {checkpoint.id} at tweet #{data['next_index'] + 1}.[/]")
+        if data['last_action_at']:
+            pacer.seed_last_call('create_tweet', data['last_action_at'])
+        data['status'] = 'running'
+        if data['kind'] == 'bulk':
+            result = await bulk_tweets_twikit(client, checkpoint.source(account), data['delay'], account, checkpoint)
+        elif data['kind'] == 'thread':
+            result = await thread_tweets_twikit(client, checkpoint.source(account), data['delay'],
+                                                reply_to=data['last_tweet_id'], checkpoint=checkpoint)
+        else:
+            result = await csv_threads_twikit(client, checkpoint.source(account), data['delay'], checkpoint)
+        if data['status'] == 'running':
+            checkpoint.finish()
+        return result
+    finally:
+        JobCheckpoint.active.discard(checkpoint.id)
+
+async def resume_jobs_menu():
+    # Jobs can belong to any saved account, not only the ones selected this session
+    checkpoints = JobCheckpoint.load_unfinished()
+    if not checkpoints:
+        cprint('[yellow]No interrupted jobs to resume.[/]')
+        return []
+    cprint('Interrupted jobs:')
+    for idx, checkpoint in enumerate(checkpoints, 1):
+        cprint(f"  {idx}. {checkpoint.describe()}")
+    cprint(f"  {len(checkpoints)+1}. All jobs")
+    cprint(f"  {len(checkpoints)+2}. Discard job(s)")
+    sel = safe_input(f"Enter number(s) separated by comma (e.g. 1,2) or {len(checkpoints)+1} for all: ").strip()
+    if sel == str(len(checkpoints)+2):
+        sel = safe_input("Job number(s) to discard: ")
+        for s in sel.split(','):
+            s = s.strip()
+            if s.isdigit() and 1 <= int(s) <= len(checkpoints):
+                checkpoints[int(s)-1].finish()
+                cprint(f'[yellow]Discarded {checkpoints[int(s)-1].id}.[/]')
+        return []
+    if sel == str(len(checkpoints)+1):
+        chosen = checkpoints
+    else:
+        chosen = [checkpoints[int(s)-1] for s in (s.strip() for s in sel.split(','))
+                  if s.isdigit() and 1 <= int(s) <= len(checkpoints)]
+    jobs = []
+    for checkpoint in chosen:
+        account = account_store.get(checkpoint.data['account'])
+        if account is None:
+            cprint(f"[red]Account {checkpoint.data['account']} no longer exists; skipping {checkpoint.id}.[/]")
+            continue
+        if checkpoint.data['csv_path'] and not os.path.exists(checkpoint.data['csv_path']):
+            cprint(f"[red]CSV file {checkpoint.data['csv_path']} is missing; skipping {checkpoint.id}.[/]")
+            continue
+        client = await session_pool.get(account)
+        jobs.append((account, lambda client=client, account=account, checkpoint=checkpoint:
+                     run_checkpointed_job(client, account, checkpoint)))
+    return jobs
+
+# Multi-account executor
+
+def account_slot(account):
+    key = account['name']
+    if key not in _account_slots:
+        _account_slots[key] = asyncio.Semaphore(MAX_JOBS_PER_ACCOUNT)
+    return _account_slots[key]
+
+async def run_account_jobs(jobs, max_concurrency=MAX_CONCURRENT_ACCOUNTS):
+    # jobs is a list of (account, job) where job() returns the coroutine to run.
+    # Each account keeps its own delay schedule; accounts only wait on each other
+    # when more than max_concurrency of them are selected.
+    # Returns one result dict per job, in the order given. Times come from the
+    # event loop's clock, so a dry run reports virtual seconds.
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def run_job(account, job):
+        async with account_slot(account):
+            async with limit:
+                current_account.set(account['name'])
+                outcomes = collections.Counter()
+                job_outcomes.set(outcomes)
+                result = {'account': account['name'], 'ok': True, 'error': None, 'result': None}
+                job_started = loop.time()
+                cprint(f'[bold blue]Started job for account: {account["name"]} ({account["username"]})[/]')
+                try:
+                    result['result'] = await job()
+                    cprint(f'[bold blue]Finished job for account: {account["name"]}[/]')
+                except Exception as e:
+                    cprint(f'[red]Job failed for account {account["name"]}: {e}[/]')
+                    log_action(f'Job failed for account {account["name"]}: {e}', action='job', outcome='error')
+                    result['ok'] = False
+                    result['error'] = str(e)
+                result['outcomes'] = dict(outcomes)
+                result['seconds'] = round(loop.time() - job_started, 1)
+                return result
+
+    retry_stats.reset()
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    results = await asyncio.gather(*(run_job(account, job) for account, job in jobs))
+    cprint(f'[bold green]Ran {len(jobs)} account job(s) in {int(loop.time() - started)} seconds.[/]')
+    metrics.write()
+    return results
+
+def prepare_action_job(client, account, action):
+    # Prompts for the action's parameters and returns a callable that starts it,
+    # so every account can be prompted up front and then run concurrently.
+    if action == "Post a tweet":
+        tweet_content = safe_input("Enter the tweet you want to post: ")
+        return lambda: post_tweet_twikit(client, tweet_content)
+    if action == "Schedule a tweet":
+        tweet_content = safe_input("Enter the tweet you want to schedule: ")
+        schedule_time = safe_input("Enter the date and time to post (YYYY-MM-DD HH:MM, 24h): ")
+        return lambda: schedule_tweet_twikit(account, tweet_content, schedule_time)
+    if action == "Tweet multiple tweets (bulk)":
+        tweet_list = []
+        cprint('[cyan]Enter each tweet. Leave blank and press Enter to finish.[/]')
+        while True:
+            t = safe_input(f"Tweet #{len(tweet_list)+1} (leave blank to finish): ")
+            if not t:
+                break
+            tweet_list.append(t)
+        delay = get_delay_input()
+        return lambda: run_checkpointed_job(client, account, JobCheckpoint.create('bulk', account, delay, tweets=tweet_list))
+    if action == "Tweet a thread":
+        tweet_list = []
+        cprint('[cyan]Enter each tweet for the thread. Leave blank and press Enter to finish.[/]')
+        while True:
+            t = safe_input(f"Thread tweet #{len(tweet_list)+1} (leave blank to finish): ")
+            if not t:
+                break
+            tweet_list.append(t)
+        delay = get_delay_input()
+        return lambda: run_checkpointed_job(client, account, JobCheckpoint.create('thread', account, delay, tweets=tweet_list))
+    if action in ["Like tweets", "Retweet tweets", "Follow users"]:
+        query = safe_input("Enter the search query or hashtag: ")
+        count = safe_input("How many tweets/users to process? (default 1): ")
+        count = int(count) if count.isdigit() else 1
+        delay = get_delay_input()
+        if action == "Like tweets":
+            return lambda: like_tweets_twikit(client, query, count, delay)
+        if action == "Retweet tweets":
+            return lambda: retweet_tweets_twikit(client, query, count, delay)
+        return lambda: follow_users_twikit(client, query, count, delay)
+    if action == "Reply to a tweet":
+        reply_mode = numbered_menu("Reply by search or by tweet URL?", ["Search", "Tweet URL"])
+        if reply_mode == "Tweet URL":
+            tweet_url = safe_input("Enter the tweet URL: ")
+            reply_text = safe_input("Enter your reply text: ")
+            return lambda: reply_to_tweet_url_twikit(client, tweet_url, reply_text)
+        query = safe_input("Enter the search query or hashtag: ")
+        reply_text = safe_input("Enter your reply text: ")
+        count = safe_input("How many tweets/users to process? (default 1): ")
+        count = int(count) if count.isdigit() else 1
+        delay = get_delay_input()
+        return lambda: reply_to_tweet_twikit(client, query, reply_text, count, delay)
+    if action == "Retweet and follow users":
+        query = safe_input("Enter the search query or hashtag: ")
+        count = safe_input("How many tweets/users to process? (default 1): ")
+        count = int(count) if count.isdigit() else 1
+        delay = get_delay_input()
+        return lambda: retweet_and_follow_twikit(client, query, count, delay)
+    if action == "Follow users who retweeted a tweet":
+        tweet_url = safe_input("Enter the tweet URL: ")
+        max_users = safe_input("How many retweeters to follow? (default 10): ")
+        max_users = int(max_users) if max_users.isdigit() else 10
+        delay = get_delay_input()
+        return lambda: follow_retweeters_twikit(client, tweet_url, max_users, delay)
+    if action == "Like tweets from timeline":
+        count = safe_input("How many tweets to like from timeline? (default 1): ")
+        count = int(count) if count.isdigit() else 1
+        delay = get_delay_input()
+        return lambda: like_timeline_twikit(client, count, delay)
+    return None
+
 async def main_menu():
     accounts = account_management_menu()
     if not accounts:
@@ -495,6 +2586,19 @@ async def main_menu():
     if not selected_accounts:
         cprint('[red]No accounts selected. Exiting.[/]')
         return
+    if os.path.exists(SCHEDULE_DB):
+        # Pick up scheduled posts left over from earlier runs
+        get_schedule_dispatcher().start()
+    try:
+        await run_main_menu(selected_accounts)
+    finally:
+        if _schedule_dispatcher is not None:
+            pending = _schedule_dispatcher.pending_count()
+            _schedule_dispatcher.stop()
+            if pending:
+                cprint(f'[yellow]{pending} scheduled tweet(s) are still pending and will be posted next time the tool runs.[/]')
+
+async def run_main_menu(selected_accounts):
     while True:
         user_input = collect_user_input()
         action = user_input['action']
@@ -502,122 +2606,461 @@ async def main_menu():
             export_log_to_csv()
             safe_input("Press Enter to return to main menu...")
             continue
-        if action == "Import tweets from CSV (bulk)":
-            tweets = import_tweets_from_csv()
-            for account in selected_accounts:
-                print_banner()
-                cprint(f'[bold blue]Running bulk CSV tweet for account: {account["name"]} ({account["username"]})[/]')
-                client = Client('en-US')
-                await login_twikit(client, account)
-                delay = get_delay_input()
-                await bulk_tweets_twikit(client, tweets, delay)
-            again = numbered_menu("What do you want to do next?", ["Return to main menu", "Exit"])
-            if again == "Exit":
-                cprint('[bold yellow]Goodbye![/]')
-                break
+        if action == "Query log":
+            query_log_menu()
+            safe_input("Press Enter to return to main menu...")
             continue
-        if action == "Import tweets from CSV (thread)":
-            tweets = import_tweets_from_csv()
-            for account in selected_accounts:
-                print_banner()
-                cprint(f'[bold blue]Running thread CSV tweet for account: {account["name"]} ({account["username"]})[/]')
-                client = Client('en-US')
-                await login_twikit(client, account)
-                delay = get_delay_input()
-                await thread_tweets_twikit(client, tweets, delay)
-            again = numbered_menu("What do you want to do next?", ["Return to main menu", "Exit"])
-            if again == "Exit":
-                cprint('[bold yellow]Goodbye![/]')
-                break
+        if action == "Log summary report":
+            log_summary_menu()
+            safe_input("Press Enter to return to main menu...")
             continue
-        for account in selected_accounts:
-            print_banner()
-            cprint(f'[bold blue]Running action for account: {account["name"]} ({account["username"]})[/]')
-            client = Client('en-US')
-            await login_twikit(client, account)
-            tweet_content = None
-            tweet_list = None
-            schedule_time = None
-            query = None
-            count = 1
-            reply_text = None
-            tweet_url = None
-            max_users = 10
-            reply_mode = None
-            if action == "Post a tweet":
-                tweet_content = safe_input("Enter the tweet you want to post: ")
-                await post_tweet_twikit(client, tweet_content)
-            elif action == "Schedule a tweet":
-                tweet_content = safe_input("Enter the tweet you want to schedule: ")
-                schedule_time = safe_input("Enter the date and time to post (YYYY-MM-DD HH:MM, 24h): ")
-                await schedule_tweet_twikit(client, tweet_content, schedule_time)
-            elif action == "Tweet multiple tweets (bulk)":
-                tweet_list = []
-                cprint('[cyan]Enter each tweet. Leave blank and press Enter to finish.[/]')
-                while True:
-                    t = safe_input(f"Tweet #{len(tweet_list)+1} (leave blank to finish): ")
-                    if not t:
-                        break
-                    tweet_list.append(t)
-                delay = get_delay_input()
-                await bulk_tweets_twikit(client, tweet_list, delay)
-            elif action == "Tweet a thread":
-                tweet_list = []
-                cprint('[cyan]Enter each tweet for the thread. Leave blank and press Enter to finish.[/]')
-                while True:
-                    t = safe_input(f"Thread tweet #{len(tweet_list)+1} (leave blank to finish): ")
-                    if not t:
-                        break
-                    tweet_list.append(t)
-                delay = get_delay_input()
-                await thread_tweets_twikit(client, tweet_list, delay)
-            elif action in ["Like tweets", "Retweet tweets", "Follow users"]:
-                query = safe_input("Enter the search query or hashtag: ")
-                count = safe_input("How many tweets/users to process? (default 1): ")
-                count = int(count) if count.isdigit() else 1
-                delay = get_delay_input()
-                if action == "Like tweets":
-                    await like_tweets_twikit(client, query, count, delay)
-                elif action == "Retweet tweets":
-                    await retweet_tweets_twikit(client, query, count, delay)
-                elif action == "Follow users":
-                    await follow_users_twikit(client, query, count, delay)
-            elif action == "Reply to a tweet":
-                reply_mode = numbered_menu("Reply by search or by tweet URL?", ["Search", "Tweet URL"])
-                if reply_mode == "Tweet URL":
-                    tweet_url = safe_input("Enter the tweet URL: ")
-                    reply_text = safe_input("Enter your reply text: ")
-                    await reply_to_tweet_url_twikit(client, tweet_url, reply_text)
-                else:
-                    query = safe_input("Enter the search query or hashtag: ")
-                    reply_text = safe_input("Enter your reply text: ")
-                    count = safe_input("How many tweets/users to process? (default 1): ")
-                    count = int(count) if count.isdigit() else 1
-                    delay = get_delay_input()
-                    await reply_to_tweet_twikit(client, query, reply_text, count, delay)
-            elif action == "Retweet and follow users":
-                query = safe_input("Enter the search query or hashtag: ")
-                count = safe_input("How many tweets/users to process? (default 1): ")
-                count = int(count) if count.isdigit() else 1
-                delay = get_delay_input()
-                await retweet_and_follow_twikit(client, query, count, delay)
-            elif action == "Follow users who retweeted a tweet":
-                tweet_url = safe_input("Enter the tweet URL: ")
-                max_users = safe_input("How many retweeters to follow? (default 10): ")
-                max_users = int(max_users) if max_users.isdigit() else 10
-                delay = get_delay_input()
-                await follow_retweeters_twikit(client, tweet_url, max_users, delay)
-            elif action == "Like tweets from timeline":
-                count = safe_input("How many tweets to like from timeline? (default 1): ")
-                count = int(count) if count.isdigit() else 1
+        if action == "View scheduled tweets":
+            show_scheduled_tweets()
+            safe_input("Press Enter to return to main menu...")
+            continue
+        jobs = []
+        if action in ["Import tweets from CSV (bulk)", "Import tweets from CSV (thread)"]:
+            path, skip_lines = import_tweets_from_csv()
+            if path is None:
+                safe_input("Press Enter to return to main menu...")
+                continue
+            mode = 'bulk' if action == "Import tweets from CSV (bulk)" else 'thread'
+            for account in selected_accounts:
+                # Only a separator per account; the banner is drawn once per menu loop
+                cprint(f'\n[bold blue]{MENU_SEPARATOR}[/]')
+                cprint(f'[bold blue]Preparing {mode} CSV tweet for account: {account["name"]} ({account["username"]})[/]')
+                client = await session_pool.get(account)
                 delay = get_delay_input()
-                await like_timeline_twikit(client, count, delay)
+                # Each account streams its own rows from the file when its job runs
+                kind = 'bulk' if mode == 'bulk' else 'csv_thread'
+                jobs.append((account, lambda client=client, account=account, delay=delay, kind=kind: run_checkpointed_job(
+                    client, account, JobCheckpoint.create(kind, account, delay, csv_path=path, skip_lines=skip_lines))))
+        elif action == "Resume interrupted jobs":
+            jobs = await resume_jobs_menu()
+            if not jobs:
+                safe_input("Press Enter to return to main menu...")
+                continue
+        else:
+            for account in selected_accounts:
+                # Only a separator per account; the banner is drawn once per menu loop
+                cprint(f'\n[bold blue]{MENU_SEPARATOR}[/]')
+                cprint(f'[bold blue]Preparing action for account: {account["name"]} ({account["username"]})[/]')
+                client = await session_pool.get(account)
+                job = prepare_action_job(client, account, action)
+                if job is not None:
+                    jobs.append((account, job))
+        await run_account_jobs(jobs)
+        session_pool.print_stats()
+        if _shared_transport is not None:
+            _shared_transport.print_stats()
+        read_cache.print_stats()
+        retry_stats.print_stats()
+        metrics.print_stats()
+        if pacer.rate_limited_count:
+            cprint(f'[cyan]Pacer: {pacer.rate_limited_count} rate-limit pause(s).[/]')
+        if done_index.skipped:
+            cprint(f'[cyan]Already-done index: skipped {done_index.skipped} target(s) without an API call.[/]')
         again = numbered_menu("What do you want to do next?", ["Return to main menu", "Exit"])
         if again == "Exit":
             cprint('[bold yellow]Goodbye![/]')
             break
 
+# Headless job files. `python twitter_twikit.py --job jobs.json` (or .toml) runs
+# the listed steps for the listed accounts without any prompt, using saved
+# cookies/credentials, then prints a JSON summary on stdout. Progress messages
+# go to stderr so the summary can be piped or parsed.
+
+EXIT_OK = 0
+EXIT_ACTIONS_FAILED = 1
+EXIT_BAD_JOB_FILE = 2
+EXIT_LOGIN_FAILED = 3
+EXIT_INTERRUPTED = 130
+
+# Job file action -> (required fields, optional fields)
+HEADLESS_ACTIONS = {
+    'post': (('text',), ()),
+    'schedule': (('text', 'at'), ()),
+    'bulk': ((), ('tweets', 'csv', 'delay')),
+    'thread': ((), ('tweets', 'csv', 'delay')),
+    'like': (('query',), ('count', 'delay')),
+    'retweet': (('query',), ('count', 'delay')),
+    'follow': (('query',), ('count', 'delay')),
+    'reply': (('text',), ('query', 'url', 'count', 'delay')),
+    'retweet_follow': (('query',), ('count', 'delay')),
+    'follow_retweeters': (('url',), ('max_users', 'delay')),
+    'like_timeline': ((), ('count', 'delay')),
+    'resume': ((), ()),
+}
+
+class JobFileError(Exception):
+    pass
+
+# Job file fields that must be non-negative integers, and ones that must be strings
+JOB_INT_FIELDS = ('count', 'max_users', 'delay')
+JOB_STR_FIELDS = ('text', 'at', 'query', 'url', 'csv')
+
+def is_count(value, minimum=0):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= minimum
+
+def check_job_accounts(accounts, where):
+    if accounts != 'all' and (not isinstance(accounts, list) or not all(isinstance(name, str) for name in accounts)):
+        raise JobFileError(f'{where}: accounts must be "all" or a list of account names')
+
+def load_job_file(path):
+    # Returns (accounts by name, max_concurrency, steps) or raises JobFileError
+    try:
+        if path.endswith('.toml'):
+            if tomllib is None:
+                raise JobFileError('TOML job files need Python 3.11+; use a .json job file instead')
+            with open(path, 'rb') as f:
+                spec = tomllib.load(f)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                spec = json.load(f)
+    except (OSError, ValueError) as e:
+        raise JobFileError(f'cannot read {path}: {e}')
+    if not isinstance(spec, dict) or not isinstance(spec.get('jobs', []), list):
+        raise JobFileError('expected an object with a "jobs" list')
+    saved = {acc['name']: acc for acc in account_store.all()}
+    default_accounts = spec.get('accounts', 'all')
+    check_job_accounts(default_accounts, 'accounts')
+    max_concurrency = spec.get('max_concurrency', MAX_CONCURRENT_ACCOUNTS)
+    if not is_count(max_concurrency, 1):
+        raise JobFileError('max_concurrency must be a positive integer')
+    steps = []
+    for number, step in enumerate(spec.get('jobs', []), 1):
+        if not isinstance(step, dict):
+            raise JobFileError(f'job #{number}: expected an object')
+        action = step.get('action')
+        if action not in HEADLESS_ACTIONS:
+            raise JobFileError(f'job #{number}: unknown action {action!r} (expected one of {", ".join(HEADLESS_ACTIONS)})')
+        required, optional = HEADLESS_ACTIONS[action]
+        missing = [field for field in required if field not in step]
+        unknown = set(step) - set(required) - set(optional) - {'action', 'accounts'}
+        if missing:
+            raise JobFileError(f'job #{number} ({action}): missing {", ".join(missing)}')
+        if unknown:
+            raise JobFileError(f'job #{number} ({action}): unknown field(s) {", ".join(sorted(unknown))}')
+        for field in JOB_INT_FIELDS:
+            if field in step and not is_count(step[field]):
+                raise JobFileError(f'job #{number} ({action}): {field} must be a non-negative integer')
+        for field in JOB_STR_FIELDS:
+            if field in step and not isinstance(step[field], str):
+                raise JobFileError(f'job #{number} ({action}): {field} must be a string')
+        if 'tweets' in step and (not isinstance(step['tweets'], list) or not step['tweets']
+                                 or not all(isinstance(tweet, str) for tweet in step['tweets'])):
+            raise JobFileError(f'job #{number} ({action}): tweets must be a non-empty list of strings')
+        if 'accounts' in step:
+            check_job_accounts(step['accounts'], f'job #{number} ({action})')
+        if action in ('bulk', 'thread') and ('tweets' in step) == ('csv' in step):
+            raise JobFileError(f'job #{number} ({action}): give either tweets or csv')
+        if action == 'reply' and ('query' in step) == ('url' in step):
+            raise JobFileError(f'job #{number} (reply): give either query or url')
+        if action == 'schedule':
+            try:
+                datetime.strptime(step['at'], "%Y-%m-%d %H:%M")
+            except (TypeError, ValueError):
+                raise JobFileError(f'job #{number} (schedule): at must be YYYY-MM-DD HH:MM')
+        names = step.get('accounts', default_accounts)
+        names = list(saved) if names == 'all' else names
+        unknown_accounts = [name for name in names if name not in saved]
+        if unknown_accounts:
+            raise JobFileError(f'job #{number} ({action}): unknown account(s) {", ".join(unknown_accounts)}')
+        step = dict(step, number=number, accounts=names)
+        if 'csv' in step:
+            try:
+                stats, problems = validate_csv_tweets(step['csv'])
+            except (OSError, ValueError) as e:
+                raise JobFileError(f'job #{number} ({action}): cannot read {step["csv"]}: {e}')
+            step['skip_lines'] = {line for line, _ in problems}
+            step['csv_problems'] = len(problems)
+        steps.append(step)
+    if not steps:
+        raise JobFileError('no jobs listed')
+    used = {name for step in steps for name in step['accounts']}
+    return {name: saved[name] for name in saved if name in used}, max_concurrency, steps
+
+def headless_job(client, account, step):
+    # Maps one job file step onto the same coroutines the menu uses
+    action = step['action']
+    delay = step.get('delay')
+    count = step.get('count', 1)
+    if action == 'post':
+        return lambda: post_tweet_twikit(client, step['text'])
+    if action == 'schedule':
+        return lambda: schedule_tweet_twikit(account, step['text'], step['at'])
+    if action in ('bulk', 'thread'):
+        kind = action if 'tweets' in step else {'bulk': 'bulk', 'thread': 'csv_thread'}[action]
+        return lambda: run_checkpointed_job(client, account, JobCheckpoint.create(
+            kind, account, delay, tweets=step.get('tweets'), csv_path=step.get('csv'), skip_lines=step.get('skip_lines', ())))
+    if action == 'like':
+        return lambda: like_tweets_twikit(client, step['query'], count, delay)
+    if action == 'retweet':
+        return lambda: retweet_tweets_twikit(client, step['query'], count, delay)
+    if action == 'follow':
+        return lambda: follow_users_twikit(client, step['query'], count, delay)
+    if action == 'reply':
+        if 'url' in step:
+            return lambda: reply_to_tweet_url_twikit(client, step['url'], step['text'])
+        return lambda: reply_to_tweet_twikit(client, step['query'], step['text'], count, delay)
+    if action == 'retweet_follow':
+        return lambda: retweet_and_follow_twikit(client, step['query'], count, delay)
+    if action == 'follow_retweeters':
+        return lambda: follow_retweeters_twikit(client, step['url'], step.get('max_users', 10), delay)
+    if action == 'like_timeline':
+        return lambda: like_timeline_twikit(client, count, delay)
+
+    async def resume():
+        resumed = 0
+        for checkpoint in JobCheckpoint.load_unfinished():
+            if checkpoint.data['account'] == account['name']:
+                await run_checkpointed_job(client, account, checkpoint)
+                resumed += 1
+        return resumed
+    return resume
+
+async def run_job_file(path, dry_run=False):
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    summary = {'job_file': path, 'started_at': datetime.now().isoformat(), 'logins': {}, 'steps': []}
+    if dry_run:
+        summary['dry_run'] = True
+    real_stdout = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            accounts, max_concurrency, steps = load_job_file(path)
+        except JobFileError as e:
+            summary['error'] = str(e)
+            exit_code = EXIT_BAD_JOB_FILE
+        else:
+            run_steps = run_dry_steps if dry_run else run_headless_steps
+            exit_code = await run_steps(accounts, max_concurrency, steps, summary)
+    summary['exit_code'] = exit_code
+    summary['seconds'] = round(loop.time() - started, 1)
+    json.dump(summary, real_stdout, indent=2, default=str)
+    real_stdout.write('\n')
+    return exit_code
+
+async def run_headless_steps(accounts, max_concurrency, steps, summary):
+    pool = SessionPool(interactive=False)
+    active_session_pool.set(pool)
+    clients = {}
+    for name, account in accounts.items():
+        try:
+            clients[name] = await pool.get(account)
+            summary['logins'][name] = 'ok'
+        except Exception as e:
+            cprint(f'[red]Login failed for {name}: {e}[/]')
+            log_action(f'Login failed for {account["username"]}: {e}', action='login', outcome='error', account=name)
+            summary['logins'][name] = f'error: {e}'
+    if not clients:
+        return EXIT_LOGIN_FAILED
+    if os.path.exists(SCHEDULE_DB):
+        get_schedule_dispatcher().start()
+    failed = False
+    try:
+        for step in steps:
+            jobs = [(accounts[name], headless_job(clients[name], accounts[name], step))
+                    for name in step['accounts'] if name in clients]
+            cprint(f"[bold magenta]Job #{step['number']}: {step['action']} for {len(jobs)} account(s)[/]")
+            results = await run_account_jobs(jobs, max_concurrency)
+            for name in step['accounts']:
+                if name not in clients:
+                    results.append({'account': name, 'ok': False, 'error': 'login failed', 'result': None, 'outcomes': {}})
+            for result in results:
+                if not result['ok'] or result['outcomes'].get('error'):
+                    failed = True
+            entry = {'job': step['number'], 'action': step['action'], 'accounts': results,
+                     'retries': dict(retry_stats.retries)}
+            if step.get('csv_problems'):
+                entry['csv_rows_skipped'] = step['csv_problems']
+            summary['steps'].append(entry)
+    finally:
+        if _schedule_dispatcher is not None:
+            summary['scheduled_pending'] = _schedule_dispatcher.pending_count()
+            _schedule_dispatcher.stop()
+    lookups = read_cache.hits + read_cache.misses
+    summary['stats'] = {
+        'rate_limit_pauses': pacer.rate_limited_count,
+        'retry_seconds': round(retry_stats.retry_time, 3),
+        'already_done_skipped': done_index.skipped,
+        'read_cache_hits': read_cache.hits,
+        'read_cache_misses': read_cache.misses,
+        'read_cache_hit_rate': round(read_cache.hits / lookups, 3) if lookups else None,
+    }
+    return EXIT_ACTIONS_FAILED if failed or len(clients) < len(accounts) else EXIT_OK
+
+# Dry runs. `--job FILE --dry-run` plays a job file through the real action
+# coroutines against fake_twikit's stand-in client, on an event loop whose
+# clock jumps to the next timer instead of sleeping: delays, rate-limit pauses,
+# backoff and API latency all pass in virtual time, so hours of pacing finish
+# in seconds. Nothing is posted, logged, scheduled or marked done. The JSON
+# summary adds a projection: wall-clock time, requests per endpoint per account
+# and the peak request rate.
+
+DRY_RUN_LATENCY = 0.5  # seconds per simulated API call, +/- half of it
+DRY_RUN_RATE_WINDOW = 60  # seconds; the peak rate is the busiest window of this length
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    # time() is virtual. When nothing is ready to run, the selector wait that
+    # would block until the next timer advances the clock to it instead.
+    def __init__(self):
+        super().__init__()
+        self.virtual_time = 0.0
+        self.started_at = time.time()
+        self._selector = VirtualSelector(self._selector, self)
+
+    def time(self):
+        return self.virtual_time
+
+    def wall_clock(self):
+        # time.time() as it would read at this point of the simulated run
+        return self.started_at + self.virtual_time
+
+class VirtualSelector:
+    def __init__(self, selector, loop):
+        self.selector = selector
+        self.loop = loop
+
+    def select(self, timeout=None):
+        events = self.selector.select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            # No timers left: only another thread can wake the loop
+            return self.selector.select(None)
+        self.loop.virtual_time += timeout
+        return []
+
+    def __getattr__(self, name):
+        return getattr(self.selector, name)
+
+class NullLogWriter:
+    def write(self, record):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+async def dry_schedule_tweet(account, tweet_content, schedule_time):
+    cprint(f'[green]Dry run: would schedule a tweet for {schedule_time} ({account["name"]}).[/]')
+    log_action(f'Dry run: scheduled tweet for {schedule_time}', action='schedule', account=account['name'])
+
+@contextlib.contextmanager
+def dry_run_state(loop):
+    # Swaps the module state a run writes to (pacer, caches, done index, log,
+    # metrics, job checkpoints, the schedule) for throwaway copies on the
+    # virtual clock, and puts the real ones back afterwards.
+    names = ('pacer', 'read_cache', 'done_index', 'retry_stats', 'metrics', '_log_writer', 'JOBS_DIR',
+             'schedule_tweet_twikit')
+    saved = {name: globals()[name] for name in names}
+    with tempfile.TemporaryDirectory() as directory:
+        globals().update(
+            pacer=Pacer(clock=loop.wall_clock),
+            read_cache=TTLCache(clock=loop.time),
+            done_index=DoneIndex(':memory:', seed=False),
+            retry_stats=RetryStats(),
+            metrics=Metrics(enabled=False),
+            _log_writer=NullLogWriter(),
+            JOBS_DIR=os.path.join(directory, JOBS_DIR),
+            schedule_tweet_twikit=dry_schedule_tweet,
+        )
+        try:
+            yield
+        finally:
+            if done_index.db is not None:
+                done_index.db.close()
+            globals().update(saved)
+
+def peak_request_rate(times, window=DRY_RUN_RATE_WINDOW):
+    # Most requests inside any `window` seconds, and when that window starts
+    times = sorted(times)
+    peak, peak_at, start = 0, None, 0
+    for end, at in enumerate(times):
+        while at - times[start] >= window:
+            start += 1
+        if end - start + 1 > peak:
+            peak, peak_at = end - start + 1, times[start]
+    return peak, peak_at
+
+async def run_dry_steps(accounts, max_concurrency, steps, summary):
+    import fake_twikit
+    loop = asyncio.get_running_loop()
+    clients = {}
+    for name, account in accounts.items():
+        clients[name] = fake_twikit.FakeClient(latency=DRY_RUN_LATENCY, jitter=DRY_RUN_LATENCY / 2,
+                                               clock=loop.wall_clock, sleep=asyncio.sleep)
+        clients[name].username = account['username']
+        summary['logins'][name] = 'simulated'
+    failed = False
+    with dry_run_state(loop):
+        for step in steps:
+            jobs = [(accounts[name], headless_job(clients[name], accounts[name], step)) for name in step['accounts']]
+            cprint(f"[bold magenta]Dry run job #{step['number']}: {step['action']} for {len(jobs)} account(s)[/]")
+            step_started = loop.time()
+            results = await run_account_jobs(jobs, max_concurrency)
+            for result in results:
+                if not result['ok'] or result['outcomes'].get('error'):
+                    failed = True
+            summary['steps'].append({'job': step['number'], 'action': step['action'], 'accounts': results,
+                                     'seconds': round(loop.time() - step_started, 1)})
+    started_at = loop.started_at
+    all_times = [at for client in clients.values() for at, _ in client.history]
+    peak, peak_at = peak_request_rate(all_times)
+    summary['projection'] = {
+        'wall_seconds': round(loop.time(), 1),
+        'wall_time': str(timedelta(seconds=int(loop.time()))),
+        'requests': {name: dict(sorted(client.calls.items())) for name, client in clients.items()},
+        'requests_total': len(all_times),
+        'peak_requests_per_window': peak,
+        'peak_window_seconds': DRY_RUN_RATE_WINDOW,
+        'peak_window_starts_at': round(peak_at - started_at, 1) if peak_at is not None else None,
+        'peak_per_account': {name: peak_request_rate([at for at, _ in client.history])[0]
+                             for name, client in clients.items()},
+    }
+    print_dry_run_projection(summary['projection'])
+    return EXIT_ACTIONS_FAILED if failed else EXIT_OK
+
+def print_dry_run_projection(projection):
+    cprint(f'\n[bold magenta]{MENU_SEPARATOR}[/]')
+    cprint(f"[bold yellow]Dry run projection: {projection['wall_time']} wall-clock, "
+           f"{projection['requests_total']} requests[/]")
+    for name, requests in projection['requests'].items():
+        per_endpoint = ', '.join(f'{endpoint} {n}' for endpoint, n in requests.items()) or 'none'
+        cprint(f"  [bold green]{name}:[/] {per_endpoint} (peak {projection['peak_per_account'][name]} "
+               f"per {projection['peak_window_seconds']} s)")
+    if projection['peak_window_starts_at'] is not None:
+        cprint(f"[cyan]Peak: {projection['peak_requests_per_window']} requests in "
+               f"{projection['peak_window_seconds']} s, starting {int(projection['peak_window_starts_at'])} s in.[/]")
+    cprint(f'[bold magenta]{MENU_SEPARATOR}[/]')
+
+def dry_run_job_file(path):
+    loop = VirtualClockLoop()
+    try:
+        return loop.run_until_complete(run_job_file(path, dry_run=True))
+    finally:
+        loop.close()
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Twitter/X multi-account automation.')
+    parser.add_argument('--job', metavar='FILE',
+                        help='run a JSON/TOML job file without prompts and print a JSON summary')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='with --job: simulate the job file on a virtual clock and project its duration and requests')
+    args = parser.parse_args()
+    if args.dry_run and not args.job:
+        parser.error('--dry-run needs --job FILE')
+    if args.dry_run:
+        sys.exit(dry_run_job_file(args.job))
+    if args.job:
+        try:
+            sys.exit(asyncio.run(run_job_file(args.job)))
+        except KeyboardInterrupt:
+            print('Cancelled by user.', file=sys.stderr)
+            sys.exit(EXIT_INTERRUPTED)
     try:
         asyncio.run(main_menu())
     except KeyboardInterrupt: